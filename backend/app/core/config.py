@@ -77,6 +77,8 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
     RESET_TOKEN_EXPIRE_MINUTES: int = 60 # 1 hour for password reset
+    AUTH_CACHE_TTL_SECONDS: int = 30 # How long a verified session cookie skips JWT decode + user lookup
+    AUTH_CACHE_MAX_SIZE: int = 10000 # Maximum number of cached sessions per process
 
     # Participation Token settings (for anonymous/embedded users)
     PARTICIPATION_TOKEN_SECRET_KEY: str
@@ -2,9 +2,10 @@
 Centralized database connection manager for TopicTrends application.
 """
 
-import motor.motor_asyncio
-from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo import AsyncMongoClient, ASCENDING, DESCENDING
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+import asyncio
 import logging
 import os
 from typing import Optional
@@ -12,9 +13,12 @@ from typing import Optional
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Connections opened at startup so the first burst of traffic skips handshakes
+MIN_POOL_SIZE = 20
+
 # Global variables
-client: Optional[motor.motor_asyncio.AsyncIOMotorClient] = None
-db: Optional[motor.motor_asyncio.AsyncIOMotorDatabase] = None
+client: Optional[AsyncMongoClient] = None
+db: Optional[AsyncDatabase] = None
 
 async def initialize_database():
     """Initialize MongoDB connection and set up global client and db objects."""
@@ -28,11 +32,11 @@ async def initialize_database():
 
     try:
         logger.info("Connecting to MongoDB...")
-        client = motor.motor_asyncio.AsyncIOMotorClient(
+        client = AsyncMongoClient(
             mongodb_url,
             # Million-user performance settings
             maxPoolSize=500,                # Massive connection pool for high concurrency
-            minPoolSize=20,                 # Higher minimum connections
+            minPoolSize=MIN_POOL_SIZE,      # Higher minimum connections
             maxIdleTimeMS=30000,           # 30 second idle timeout
             serverSelectionTimeoutMS=5000,  # 5 second timeout
             connectTimeoutMS=10000,         # 10 second timeout
@@ -80,17 +84,42 @@ async def initialize_database():
         await db.user_interaction_states.create_index([("user_identifier", ASCENDING), ("entity_id", ASCENDING), ("last_updated_at", DESCENDING)], name="idx_userstate_user_entity_lookup")
         await db.entity_metrics.create_index([("entity_type", ASCENDING), ("metrics.last_activity_at", DESCENDING)], name="idx_entity_metrics_type_activity_trending")
         await db.password_reset_tokens.create_index([("token", ASCENDING)], name="idx_pwd_reset_token_lookup", unique=True)
+        # TTL: MongoDB purges reset tokens on their own once expires_at has passed
+        await db.password_reset_tokens.create_index([("expires_at", ASCENDING)], name="idx_pwd_reset_token_ttl", expireAfterSeconds=0)
+
+        # --- /users/me hot paths (every query there starts with an equality on the user) ---
+        await db.ideas.create_index([("user_id", ASCENDING), ("timestamp", DESCENDING)], name="idx_ideas_user_time")
+        await db.ideas.create_index([("user_id", ASCENDING), ("discussion_id", ASCENDING)], name="idx_ideas_user_discussion")
+        await db.discussions.create_index([("creator_id", ASCENDING), ("created_at", DESCENDING)], name="idx_discussions_creator_created_at")
+        await db.interaction_events.create_index([("user_id", ASCENDING), ("timestamp", DESCENDING)], name="idx_interaction_user_time")
 
         # TODO delete when it becomes a problem. These text indexes make it about 4-5 times slow to do writes, eventually offload to OpenSearch, Elasticsearch, Atlas Search
         await db.ideas.create_index([("text", "text"), ("keywords", "text")], name="ideas_text_search_index")
 
+        await _warm_connection_pool(db)
+
         return db
             
     except (ConnectionFailure, ServerSelectionTimeoutError) as e:
         logger.error(f"Failed to connect to MongoDB: {e}")
         raise
 
-async def get_db():
+async def _warm_connection_pool(database: AsyncDatabase):
+    """Open minPoolSize connections now instead of during the first requests.
+
+    The driver only fills the pool in the background; concurrent no-op reads force each
+    connection's TCP/TLS handshake to happen here, before traffic arrives.
+    """
+    try:
+        await asyncio.gather(*(
+            database.users.find_one({"_id": None}, {"_id": 1}) for _ in range(MIN_POOL_SIZE)
+        ))
+        logger.info(f"MongoDB connection pool warmed with {MIN_POOL_SIZE} connections")
+    except Exception as e:
+        # Warmup is best effort; the pool still grows on demand
+        logger.warning(f"MongoDB connection pool warmup failed: {e}")
+
+async def get_db() -> AsyncDatabase:
     """Get database instance, initializing if needed."""
     global db
     if db is None:
@@ -107,5 +136,5 @@ def init_db(app):
     async def shutdown_db_client():
         global client
         if client:
-            client.close()
+            await client.close()
             logger.info("Disconnected from MongoDB")
\ No newline at end of file
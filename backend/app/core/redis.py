@@ -12,6 +12,27 @@ logger = logging.getLogger(__name__)
 _redis = None
 _fallback_storage = defaultdict(list)  # In-memory fallback for development
 
+class RedisFallbackPipeline:
+    """Queues commands against a RedisFallback and runs them in order on execute()"""
+
+    def __init__(self, redis: "RedisFallback"):
+        self._redis = redis
+        self._commands = []
+
+    def __getattr__(self, name: str):
+        command = getattr(self._redis, name)
+
+        def queue(*args, **kwargs):
+            self._commands.append((command, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self) -> list:
+        """Run queued commands and return their results"""
+        commands, self._commands = self._commands, []
+        return [await command(*args, **kwargs) for command, args, kwargs in commands]
+
 class RedisFallback:
     """In-memory Redis fallback for development when Redis is not available"""
 
@@ -31,6 +52,19 @@ class RedisFallback:
             return (key, value)
         return None
 
+    async def rpop(self, key: str, count: Optional[int] = None):
+        """Remove and return the rightmost element, or up to count elements as a list"""
+        items = self.storage[key]
+        if count is None:
+            return items.pop() if items else None
+        popped = [items.pop() for _ in range(min(count, len(items)))]
+        return popped or None
+
+    async def rpush(self, key: str, *values: str) -> int:
+        """Add values to the right of the list, in order"""
+        self.storage[key].extend(values)
+        return len(self.storage[key])
+
     async def exists(self, key: str) -> bool:
         """Check if key exists"""
         return key in self.key_values
@@ -58,6 +92,15 @@ class RedisFallback:
             return [k for k in self.key_values.keys() if k.startswith(prefix)]
         return []
 
+    async def scan_iter(self, match: str = "*", count: Optional[int] = None):
+        """Iterate keys matching pattern"""
+        for key in await self.keys(match):
+            yield key
+
+    def pipeline(self, transaction: bool = True) -> RedisFallbackPipeline:
+        """Batch commands like a Redis pipeline (runs them sequentially in memory)"""
+        return RedisFallbackPipeline(self)
+
     async def ttl(self, key: str) -> int:
         """Get time to live (always return -1 for fallback)"""
         return -1
@@ -1,13 +1,13 @@
-from pydantic import BaseModel, Field, EmailStr
-from typing import Optional
-from datetime import datetime
+from pydantic import BaseModel, Field, EmailStr, ConfigDict, AliasChoices, field_validator
+from typing import Optional, List, Any
+from datetime import datetime, timezone
 
 class UserBase(BaseModel):
     email: EmailStr
     username: str = Field(..., min_length=3, max_length=50)
 
 class UserCreate(UserBase):
-    password: str = Field(..., min_length=8)
+    password: str = Field(..., min_length=8, max_length=256)
 
 class UserLogin(BaseModel):
     email: EmailStr
@@ -19,7 +19,7 @@ class UserVerification(BaseModel):
 class PasswordReset(BaseModel):
     email: EmailStr
     token: str
-    password: str = Field(..., min_length=8)
+    password: str = Field(..., min_length=8, max_length=256)
 
 class TokenResponse(BaseModel):
     access_token: str
@@ -59,4 +59,68 @@ class User(UserBase):
                 "is_active": True,
                 "is_verified": True
             }
-        }
\ No newline at end of file
+        }
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+# --- /users/me response models ---
+# Built straight from MongoDB documents: `_id` is accepted as `id` and any
+# extra stored fields are ignored, so pydantic-core does the shaping.
+# Stored values are passed through as-is (the AI fields in particular vary across
+# older documents), so one irregular idea can't fail a response that is already streaming.
+class UserIdea(BaseModel):
+    model_config = ConfigDict(extra='ignore', populate_by_name=True)
+
+    id: str = Field(validation_alias=AliasChoices("id", "_id"))
+    text: Any = ""
+    user_id: Any = None
+    verified: Any = False
+    timestamp: Any = Field(default_factory=_utcnow)
+    topic_id: Any = None
+    discussion_id: Any = None
+    submitter_display_id: Any = None
+    intent: Any = None
+    sentiment: Any = None
+    specificity: Any = None
+    keywords: Any = Field(default_factory=list)
+    related_topics: Any = Field(default_factory=list)
+    on_topic: Any = None
+
+    @field_validator('id', mode='before')
+    @classmethod
+    def stringify_id(cls, v: Any) -> str:
+        return str(v)
+
+class UserDiscussion(BaseModel):
+    model_config = ConfigDict(extra='ignore', populate_by_name=True)
+
+    id: str = Field(validation_alias=AliasChoices("id", "_id"))
+    title: Optional[str] = "Untitled Discussion"
+    prompt: Optional[str] = ""
+    require_verification: Optional[bool] = False
+    idea_count: Optional[int] = 0
+    topic_count: Optional[int] = 0
+    creator_id: Optional[str] = None
+    created_at: datetime = Field(default_factory=_utcnow)
+    last_activity: Optional[datetime] = None
+    join_link: Optional[str] = None
+    qr_code: Optional[str] = None
+
+    @field_validator('id', mode='before')
+    @classmethod
+    def stringify_id(cls, v: Any) -> str:
+        return str(v)
+
+    @field_validator('qr_code', mode='before')
+    @classmethod
+    def drop_qr_code(cls, v: Any) -> None:
+        # Don't send QR code data to reduce payload size
+        return None
+
+class UserIdeasResponse(BaseModel):
+    ideas: List[UserIdea]
+    discussions: List[UserDiscussion]
+
+class UserDiscussionsResponse(BaseModel):
+    discussions: List[UserDiscussion]
@@ -4,10 +4,9 @@ from datetime import timedelta, timezone, datetime
 import uuid
 import logging
 from typing import Annotated
+from pymongo.errors import DuplicateKeyError
 
 logger = logging.getLogger(__name__)
-import secrets
-import string
 
 from app.models.user_schemas import (
     UserCreate, UserVerification, User, UserUpdateProfile,
@@ -21,7 +20,10 @@ from app.services.auth import (
     generate_csrf_token, # Import CSRF generator
     CSRF_COOKIE_NAME,    # Import CSRF cookie name
     ACCESS_TOKEN_EXPIRE_MINUTES,
-    verify_csrf_dependency # Import CSRF dependency
+    verify_csrf_dependency, # Import CSRF dependency
+    invalidate_session_cache,
+    generate_verification_code,
+    SESSION_USER_PROJECTION
 )
 from app.services.email import send_verification_email, send_password_reset_email
 from app.core.database import get_db
@@ -40,7 +42,7 @@ async def register(
     background_tasks: BackgroundTasks
     ):
     """Register a new user"""
-    existing_user = await get_user_by_email(user.email)
+    existing_user = await get_user_by_email(user.email, {"_id": 1})
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -54,7 +56,14 @@ async def register(
         "password": user.password
     }
 
-    result = await create_user(user_data)
+    try:
+        result = await create_user(user_data)
+    except DuplicateKeyError:
+        # Lost a race with a concurrent signup for the same email; the unique index decides
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
 
     background_tasks.add_task(
         send_verification_email,
@@ -147,6 +156,9 @@ async def logout(
     response: Response):
     """Logout user by clearing access and CSRF cookies."""
     # CSRF check is handled by the dependency
+    # Stop serving this session from the verification cache
+    invalidate_session_cache(request.cookies.get("access_token"))
+
     cookie_domain = None
     is_secure_cookie = False 
     if settings.ENVIRONMENT != "development":
@@ -191,7 +203,7 @@ async def resend_verification(
     if not email:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email is required.")
 
-    user = await get_user_by_email(email)
+    user = await get_user_by_email(email, {"_id": 1, "username": 1, "is_verified": 1})
     if not user:
         # Avoid confirming email existence
         logger.info(f"Verification resend requested for non-existent/unregistered email: {email}")
@@ -202,7 +214,7 @@ async def resend_verification(
         # Avoid sending again if already verified
         return {"message": "Your email is already verified."}
 
-    verification_code = ''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(6))
+    verification_code = generate_verification_code()
     db = await get_db()
     update_result = await db.users.update_one(
         {"_id": user["_id"]}, # Use ID for certainty
@@ -272,7 +284,7 @@ async def update_profile(
     success = await update_user_profile(user_id, update_data)
     if not success:
         # Check if user exists, maybe profile wasn't actually changed?
-        updated_user_check = await get_user_by_id(user_id)
+        updated_user_check = await get_user_by_id(user_id, {"_id": 1})
         if updated_user_check:
              logger.info(f"Profile update for user {user_id} resulted in no changes.")
              # Return current data if no change
@@ -281,7 +293,7 @@ async def update_profile(
              raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
 
 
-    updated_user = await get_user_by_id(user_id)
+    updated_user = await get_user_by_id(user_id, SESSION_USER_PROJECTION)
     if not updated_user:
          # Should not happen if update seemed successful
          logger.error(f"Could not retrieve updated profile for user {user_id} after update.")
@@ -306,7 +318,7 @@ async def forgot_password(
     if not email:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email is required.")
 
-    user = await get_user_by_email(email)
+    user = await get_user_by_email(email, {"_id": 1, "username": 1, "is_verified": 1})
     generic_message = {"message": "If your email is registered and verified, you will receive a password reset link."}
 
     if not user:
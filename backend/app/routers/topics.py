@@ -68,11 +68,12 @@ async def get_discussion_topics(
         # Match topics for this discussion
         {"$match": {"discussion_id": discussion_id}},
 
-        # Lookup to count ideas only (no full idea data for performance)
+        # Lookup to count ideas only (just their ids, so embeddings never leave the server)
         {"$lookup": {
             "from": "ideas",
             "localField": "_id",
             "foreignField": "topic_id",
+            "pipeline": [{"$project": {"_id": 1}}],
             "as": "idea_count_check"
         }},
 
@@ -81,12 +82,11 @@ async def get_discussion_topics(
             "actual_count": {"$size": "$idea_count_check"}
         }},
 
-        # Project final fields (no idea data, just metadata)
+        # Project final fields (no idea data or centroid vectors, just metadata)
         {"$project": {
             "_id": 1,
             "representative_text": 1,
             "count": "$actual_count",
-            "centroid_embedding": 1,
             "created_at": 1,
             "updated_at": 1
         }}
@@ -97,7 +97,7 @@ async def get_discussion_topics(
         pipeline.append({"$sort": {mongo_sort_field: mongo_sort_direction}})
 
     # Execute aggregation
-    topic_docs = await db.topics.aggregate(pipeline).to_list(length=None)
+    topic_docs = await (await db.topics.aggregate(pipeline)).to_list(length=None)
 
     # Build results from aggregated data (no ideas loaded for performance)
     results = []
@@ -108,8 +108,7 @@ async def get_discussion_topics(
             "representative_idea_id": None,  # Will be loaded on-demand
             "representative_text": topic_doc.get("representative_text", "Untitled Topic"),
             "count": topic_doc.get("count", 0),
-            "ideas": [],  # Empty - ideas loaded on-demand via separate endpoint
-            "centroid_embedding": topic_doc.get("centroid_embedding")
+            "ideas": []  # Empty - ideas loaded on-demand via separate endpoint
         }
 
         try:
@@ -1,136 +1,282 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from fastapi.responses import StreamingResponse, ORJSONResponse
 from typing import List, Dict, Any, Annotated
+import asyncio
 import logging
+from cachetools import TTLCache
+from pymongo import DeleteMany, UpdateMany
 from app.core.limiter import limiter
 from app.core.config import settings
 from app.core.database import get_db
-from app.services.auth import verify_token_cookie, verify_csrf_dependency
-from datetime import timedelta, datetime, timezone
-from bson import ObjectId
+from app.services.auth import verify_token_cookie, verify_csrf_dependency, invalidate_user_sessions
+from app.models.user_schemas import UserIdea, UserDiscussion, UserIdeasResponse, UserDiscussionsResponse
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/users", tags=["users"])
 
-@router.get("/me/ideas")
+# Documents serialized per write when streaming large responses
+STREAM_CHUNK_SIZE = 500
+# Cursor batch size for per-user reads; large enough that a heavy user's
+# ideas come back in one or two getMores instead of one per 101 documents
+CURSOR_BATCH_SIZE = 2000
+
+# Ideas-per-day per user, shared by /me/stats and /me/engagement: dashboards load
+# both together, so the grouping over the user's ideas runs once per minute at most
+_activity_cache: TTLCache = TTLCache(maxsize=10000, ttl=60)
+
+async def _iter_json_array(docs, model):
+    """Yield a JSON array of `model`-shaped documents in chunks as they arrive."""
+    chunk = []
+    separator = ""
+    yield "["
+    async for doc in docs:
+        # str() anything JSON can't hold (e.g. a stray ObjectId) instead of failing mid-stream
+        chunk.append(model.model_validate(doc).model_dump_json(fallback=str))
+        if len(chunk) >= STREAM_CHUNK_SIZE:
+            yield separator + ",".join(chunk)
+            separator = ","
+            chunk = []
+    if chunk:
+        yield separator + ",".join(chunk)
+    yield "]"
+
+async def _prefetched(cursor):
+    """
+    Pull a cursor's first document before the response starts, so the query runs (and
+    fails, if it's going to) while a 500 can still be sent. Returns an async iterator
+    over all of the cursor's documents.
+    """
+    docs = cursor.__aiter__()
+    try:
+        first = await docs.__anext__()
+    except StopAsyncIteration:
+        first = None
+
+    async def iterate():
+        if first is None:
+            return
+        yield first
+        async for doc in docs:
+            yield doc
+
+    return iterate()
+
+def _projection_for(model, *exclude: str) -> Dict[str, int]:
+    """Projection limited to the fields a response model actually reads."""
+    return {name: 1 for name in model.model_fields if name not in ("id", *exclude)}
+
+def _user_ideas_pipeline(user_id: str) -> List[Dict[str, Any]]:
+    """
+    The user's ideas followed by the discussions they belong to, in one cursor.
+    $unionWith (rather than $facet) keeps the result a stream of documents, so it
+    is not bound by the 16MB single-document limit; `_kind` tells them apart.
+    """
+    return [
+        {"$match": {"user_id": user_id}},
+        {"$project": {**_projection_for(UserIdea), "_kind": {"$literal": "idea"}}},
+        {"$unionWith": {"coll": "ideas", "pipeline": [
+            # Discussion _ids are UUID strings (see create_discussion)
+            {"$match": {"user_id": user_id, "discussion_id": {"$type": "string"}}},
+            {"$group": {"_id": "$discussion_id"}},
+            {"$lookup": {
+                "from": "discussions",
+                "localField": "_id",
+                "foreignField": "_id",
+                "pipeline": [{"$project": _projection_for(UserDiscussion, "qr_code")}],
+                "as": "discussion"
+            }},
+            {"$unwind": "$discussion"},
+            {"$replaceRoot": {"newRoot": "$discussion"}},
+            {"$addFields": {"_kind": {"$literal": "discussion"}}}
+        ]}}
+    ]
+
+def _facet_count(facets: Dict[str, Any], name: str) -> int:
+    """Read a `{"$count": "n"}` branch of a $facet result (empty when nothing matched)."""
+    return facets[name][0]["n"] if facets[name] else 0
+
+# Collection, display field and fallback label for each interaction entity type
+_INTERACTION_ENTITY_LABELS = {
+    "topic": ("topics", "representative_text", "Untitled Topic"),
+    "idea": ("ideas", "text", "Empty idea"),
+    "discussion": ("discussions", "title", "Untitled Discussion"),
+}
+
+def _recent_interactions_pipeline(user_id: str, limit: int) -> List[Dict[str, Any]]:
+    """
+    Latest non-view interactions with their entity's display text joined in (one round-trip).
+    Shaped for the response server-side: `_id` comes back as a string `id`, and
+    interactions whose entity no longer exists are dropped.
+    """
+    pipeline = [
+        {"$match": {"user_id": user_id, "actionType": {"$ne": "view"}}},
+        {"$sort": {"timestamp": -1}},
+        {"$limit": limit},
+    ]
+    branches = []
+    for entity_type, (collection, field, fallback) in _INTERACTION_ENTITY_LABELS.items():
+        joined = f"_{entity_type}"
+        pipeline.append({"$lookup": {
+            "from": collection,
+            "localField": "entity_id",
+            "foreignField": "_id",
+            "pipeline": [{"$project": {"_id": 0, "label": {"$ifNull": [f"${field}", fallback]}}}],
+            "as": joined
+        }})
+        branches.append({
+            "case": {"$eq": ["$entity_type", entity_type]},
+            "then": {"$arrayElemAt": [f"${joined}.label", 0]}
+        })
+    pipeline += [
+        {"$addFields": {
+            "id": {"$toString": "$_id"},
+            "displaytext": {"$switch": {"branches": branches, "default": None}}
+        }},
+        {"$match": {"displaytext": {"$ne": None}}},
+        {"$project": {"_id": 0, **{f"_{entity_type}": 0 for entity_type in _INTERACTION_ENTITY_LABELS}}},
+    ]
+    return pipeline
+
+async def _aggregate_to_list(collection, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Run an aggregation and materialize it, as one awaitable (for asyncio.gather)."""
+    cursor = await collection.aggregate(pipeline)
+    return await cursor.to_list(None)
+
+def _to_date(field: str) -> Dict[str, Any]:
+    """Expression for a stored date or date string; malformed or missing values become null."""
+    return {"$convert": {"input": field, "to": "date", "onError": None, "onNull": None}}
+
+async def _activity_by_date(db, user_id: str) -> List[Dict[str, Any]]:
+    """The user's idea counts per day as [{"_id": "YYYY-MM-DD", "count": n}], newest first."""
+    activity = _activity_cache.get(user_id)
+    if activity is None:
+        activity = await _aggregate_to_list(db.ideas, [
+            {"$match": {"user_id": user_id}},
+            {"$group": {
+                "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": _to_date("$timestamp")}},
+                "count": {"$sum": 1}
+            }},
+            {"$match": {"_id": {"$ne": None}}},
+            {"$sort": {"_id": -1}}
+        ])
+        _activity_cache[user_id] = activity
+    return activity
+
+def _participation_pipeline(user_id: str) -> List[Dict[str, Any]]:
+    """
+    Discussions the user posted in and their average response time, as one row.
+    There is no visit tracking, so a discussion's first view is estimated as its
+    created_at when the user created it, otherwise 5 minutes before their first idea.
+    """
+    first_idea = "$first_idea_time"
+    return [
+        {"$match": {"user_id": user_id, "discussion_id": {"$nin": [None, ""]}}},
+        {"$group": {
+            "_id": "$discussion_id",
+            "first_idea_time": {"$min": _to_date("$timestamp")}
+        }},
+        {"$lookup": {
+            "from": "discussions",
+            "localField": "_id",
+            "foreignField": "_id",
+            "pipeline": [
+                {"$match": {"creator_id": user_id}},
+                {"$project": {"_id": 0, "created_at": _to_date("$created_at")}}
+            ],
+            "as": "created"
+        }},
+        {"$project": {
+            "response_minutes": {"$divide": [
+                {"$subtract": [first_idea, {"$ifNull": [
+                    {"$arrayElemAt": ["$created.created_at", 0]},
+                    {"$subtract": [first_idea, 5 * 60 * 1000]}
+                ]}]},
+                60 * 1000
+            ]}
+        }},
+        {"$group": {
+            "_id": None,
+            "participated": {"$sum": 1},
+            # Only non-negative response times count; $avg skips the nulls
+            "avg_response_minutes": {"$avg": {
+                "$cond": [{"$gte": ["$response_minutes", 0]}, "$response_minutes", None]
+            }}
+        }}
+    ]
+
+@router.get("/me/ideas", response_model=UserIdeasResponse)
 @limiter.limit("50/minute")
 async def get_current_user_ideas(
     request: Request,
     current_user: Annotated[dict, Depends(verify_token_cookie)]
 ):
-    """Get all ideas submitted by the current authenticated user."""
+    """
+    Get all ideas submitted by the current authenticated user.
+    The body is streamed as ideas come off the cursor, so memory stays bounded
+    to one chunk even for users with tens of thousands of ideas.
+    """
     user_id = str(current_user["_id"])
-    db = await get_db()
-    
+    username = current_user.get("username", "Anonymous")
     try:
-        # Fetch all ideas by this user
-        ideas_cursor = db.ideas.find({"user_id": user_id})
-        ideas_list = await ideas_cursor.to_list(None)
-        
-        # Extract unique discussion IDs
-        discussion_ids = set(idea.get("discussion_id") for idea in ideas_list if idea.get("discussion_id"))
-        
-        # Fetch all related discussions in one query
-        discussions_cursor = db.discussions.find({"_id": {"$in": list(discussion_ids)}})
-        discussions_list = await discussions_cursor.to_list(None)
-        
-        # Map discussions by ID for easier access
-        discussions_map = {str(d["_id"]): d for d in discussions_list}
-        
-        # Process ideas to match expected format
-        processed_ideas = []
-        for idea in ideas_list:
-            idea_id = str(idea["_id"])
-            processed_idea = {
-                "id": idea_id,
-                "text": idea.get("text", ""),
-                "user_id": user_id,
-                "verified": idea.get("verified", False),
-                "timestamp": idea.get("timestamp", datetime.now(timezone.utc)).isoformat(),
-                "topic_id": idea.get("topic_id"),
-                "discussion_id": idea.get("discussion_id"),
-                "submitter_display_id": idea.get("submitter_display_id", current_user.get("username", "Anonymous")),
-                "intent": idea.get("intent"),
-                "sentiment": idea.get("sentiment"),
-                "specificity": idea.get("specificity"),
-                "keywords": idea.get("keywords", []),
-                "related_topics": idea.get("related_topics", []),
-                "on_topic": idea.get("on_topic")
-            }
-            processed_ideas.append(processed_idea)
-            
-        # Process discussions to match expected format
-        processed_discussions = []
-        for d_id, discussion in discussions_map.items():
-            processed_discussion = {
-                "id": d_id,
-                "title": discussion.get("title", "Untitled Discussion"),
-                "prompt": discussion.get("prompt", ""),
-                "require_verification": discussion.get("require_verification", False),
-                "idea_count": discussion.get("idea_count", 0),
-                "topic_count": discussion.get("topic_count", 0),
-                "creator_id": discussion.get("creator_id"),
-                "created_at": discussion.get("created_at", datetime.now(timezone.utc)).isoformat(),
-                "last_activity": discussion.get("last_activity", datetime.now(timezone.utc)).isoformat() if discussion.get("last_activity") else None,
-                "join_link": discussion.get("join_link"),
-                "qr_code": None 
-            }
-            processed_discussions.append(processed_discussion)
-            
-        logger.info(f"User {user_id} fetched {len(processed_ideas)} ideas across {len(processed_discussions)} discussions")
-        
-        return {
-            "ideas": processed_ideas,
-            "discussions": processed_discussions
-        }
-        
+        db = await get_db()
+        docs = await _prefetched(
+            await db.ideas.aggregate(_user_ideas_pipeline(user_id), batchSize=CURSOR_BATCH_SIZE)
+        )
     except Exception as e:
         logger.error(f"Error fetching ideas for user {user_id}: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve user ideas."
         )
+    # Discussions are few (one per distinct discussion) and are held back until
+    # every idea has been written
+    discussions = []
+
+    async def user_ideas():
+        async for doc in docs:
+            if doc.pop("_kind", None) == "discussion":
+                discussions.append(doc)
+                continue
+            # Fall back to the user's name for ideas without a display ID
+            doc.setdefault("submitter_display_id", username)
+            yield doc
+
+    async def generate():
+        try:
+            yield '{"ideas":'
+            async for part in _iter_json_array(user_ideas(), UserIdea):
+                yield part
+            yield ',"discussions":['
+            yield ",".join(UserDiscussion.model_validate(d).model_dump_json() for d in discussions)
+            yield "]}"
+            logger.info(f"User {user_id} fetched ideas across {len(discussions)} discussions")
+        except Exception as e:
+            # Headers are already sent, so the best we can do is log and abort the stream
+            logger.error(f"Error streaming ideas for user {user_id}: {str(e)}", exc_info=True)
+            raise
+
+    return StreamingResponse(generate(), media_type="application/json")
 
-@router.get("/me/discussions")
+@router.get("/me/discussions", response_model=UserDiscussionsResponse)
 @limiter.limit("50/minute")
 async def get_current_user_discussions(
     request: Request,
     current_user: Annotated[dict, Depends(verify_token_cookie)]
 ):
-    """Get all discussions created by the current authenticated user."""
+    """
+    Get all discussions created by the current authenticated user.
+    Streamed off the cursor like /me/ideas rather than materialized with to_list.
+    """
     user_id = str(current_user["_id"])
-    db = await get_db()
-    
     try:
+        db = await get_db()
         # Fetch discussions created by this user
-        discussions_cursor = db.discussions.find({"creator_id": user_id}).sort([("created_at", -1)])
-        discussions_list = await discussions_cursor.to_list(None)
-        
-        # Process discussions to match expected format
-        processed_discussions = []
-        for discussion in discussions_list:
-            processed_discussion = {
-                "id": str(discussion["_id"]),
-                "title": discussion.get("title", "Untitled Discussion"),
-                "prompt": discussion.get("prompt", ""),
-                "require_verification": discussion.get("require_verification", False),
-                "idea_count": discussion.get("idea_count", 0),
-                "topic_count": discussion.get("topic_count", 0),
-                "creator_id": discussion.get("creator_id"),
-                "created_at": discussion.get("created_at", datetime.now(timezone.utc)).isoformat(),
-                "last_activity": discussion.get("last_activity", discussion.get("created_at")).isoformat() if discussion.get("last_activity") else None,
-                "join_link": discussion.get("join_link"),
-                "qr_code": None  # Don't send QR code data to reduce payload size
-            }
-            processed_discussions.append(processed_discussion)
-            
-        logger.info(f"User {user_id} fetched {len(processed_discussions)} discussions they created")
-        
-        return {
-            "discussions": processed_discussions
-        }
-        
+        discussions = await _prefetched(db.discussions.find(
+            {"creator_id": user_id},
+            _projection_for(UserDiscussion, "qr_code")
+        ).sort([("created_at", -1)]).batch_size(CURSOR_BATCH_SIZE))
     except Exception as e:
         logger.error(f"Error fetching discussions for user {user_id}: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -138,7 +284,21 @@ async def get_current_user_discussions(
             detail="Failed to retrieve user discussions."
         )
 
-@router.get("/me/stats")
+    async def generate():
+        try:
+            yield '{"discussions":'
+            async for part in _iter_json_array(discussions, UserDiscussion):
+                yield part
+            yield "}"
+            logger.info(f"User {user_id} fetched the discussions they created")
+        except Exception as e:
+            # Headers are already sent, so the best we can do is log and abort the stream
+            logger.error(f"Error streaming discussions for user {user_id}: {str(e)}", exc_info=True)
+            raise
+
+    return StreamingResponse(generate(), media_type="application/json")
+
+@router.get("/me/stats", response_class=ORJSONResponse)
 @limiter.limit("50/minute")
 async def get_current_user_stats(
     request: Request,
@@ -149,42 +309,35 @@ async def get_current_user_stats(
     db = await get_db()
     
     try:
-        # Get count of ideas submitted by this user
-        ideas_count = await db.ideas.count_documents({"user_id": user_id})
-        
-        # Get count of discussions created by this user
-        created_discussions_count = await db.discussions.count_documents({"creator_id": user_id})
-        
-        # Get count of discussions participated in
-        ideas_cursor = db.ideas.find({"user_id": user_id}, {"discussion_id": 1})
-        ideas_list = await ideas_cursor.to_list(None)
-        participated_discussions = set(idea.get("discussion_id") for idea in ideas_list if idea.get("discussion_id"))
-        participated_discussions_count = len(participated_discussions)
+        # Count of discussions created by this user, idea totals, clustered count and
+        # participated discussions in one pass, and daily activity, run concurrently
+        created_discussions_count, facet_rows, activity_data = await asyncio.gather(
+            db.discussions.count_documents({"creator_id": user_id}),
+            _aggregate_to_list(db.ideas, [
+                {"$match": {"user_id": user_id}},
+                {"$facet": {
+                    "total": [{"$count": "n"}],
+                    "clustered": [
+                        {"$match": {"topic_id": {"$exists": True, "$ne": None}}},
+                        {"$count": "n"}
+                    ],
+                    "participated": [
+                        {"$match": {"discussion_id": {"$nin": [None, ""]}}},
+                        {"$group": {"_id": "$discussion_id"}},
+                        {"$count": "n"}
+                    ]
+                }}
+            ]),
+            _activity_by_date(db, user_id)
+        )
+        facets = facet_rows[0]
         
-        # Get count of ideas that have been clustered
-        clustered_ideas_count = await db.ideas.count_documents({
-            "user_id": user_id,
-            "topic_id": {"$exists": True, "$ne": None}
-        })
+        ideas_count = _facet_count(facets, "total")
+        clustered_ideas_count = _facet_count(facets, "clustered")
+        participated_discussions_count = _facet_count(facets, "participated")
         
         clustering_rate = round((clustered_ideas_count / ideas_count) * 100) if ideas_count > 0 else 0
         
-        # Get activity over time (ideas submitted per day)
-        pipeline = [
-            {"$match": {"user_id": user_id}},
-            {"$project": {
-                "date": {"$dateToString": {"format": "%Y-%m-%d", "date": "$timestamp"}}
-            }},
-            {"$group": {
-                "_id": "$date",
-                "count": {"$sum": 1}
-            }},
-            {"$sort": {"_id": -1}}
-        ]
-        
-        activity_cursor = db.ideas.aggregate(pipeline)
-        activity_data = await activity_cursor.to_list(None)
-        
         stats = {
             "total_ideas": ideas_count,
             "clustered_ideas": clustered_ideas_count,
@@ -204,7 +357,7 @@ async def get_current_user_stats(
             detail="Failed to generate user statistics."
         )
 
-@router.get("/me/engagement")
+@router.get("/me/engagement", response_class=ORJSONResponse)
 @limiter.limit("30/minute")
 async def get_current_user_engagement(
     request: Request,
@@ -215,99 +368,43 @@ async def get_current_user_engagement(
     db = await get_db()
     
     try:
-        # Get all discussions the user has visited (from ideas collection)
-        ideas_cursor = db.ideas.find({"user_id": user_id})
-        ideas_list = await ideas_cursor.to_list(None)
-        
-        # Extract discussion IDs and timestamps
-        user_discussions = {}
-        for idea in ideas_list:
-            discussion_id = idea.get("discussion_id")
-            if not discussion_id:
-                continue
-                
-            # Track first idea timestamp per discussion
-            timestamp = idea.get("timestamp")
-            if isinstance(timestamp, str):
-                try:
-                    timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                except:
-                    timestamp = None
-            
-            if discussion_id not in user_discussions or (
-                timestamp and user_discussions[discussion_id]["first_idea_time"] > timestamp
-            ):
-                user_discussions[discussion_id] = {
-                    "first_idea_time": timestamp,
-                    "ideas_count": 0
-                }
-            
-            user_discussions[discussion_id]["ideas_count"] += 1
-        
-        # Get all discussions to calculate participation rate
-        # We'll consider a "browsed" discussion to be any discussion created by someone else
-        # that the user has viewed (this would require client-side tracking, so for now
-        # we'll use a simpler metric: all discussions in the system vs. participated discussions)
-        all_discussions_count = await db.discussions.count_documents({})
-        participated_discussions_count = len(user_discussions)
-        
+        # New users have nothing to aggregate yet; a single index probe spares the
+        # participation and activity aggregations on that (frequent) first dashboard visit
+        if await db.ideas.find_one({"user_id": user_id}, {"_id": 1}) is None:
+            all_discussions_count, recent_interactions = await asyncio.gather(
+                db.discussions.estimated_document_count(),
+                _aggregate_to_list(db.interaction_events, _recent_interactions_pipeline(user_id, 5))
+            )
+            return {
+                "participation_rate": 0.0,
+                "participated_discussions": 0,
+                "total_discussions": all_discussions_count,
+                "avg_response_time_minutes": 0,
+                "activity_heatmap": {"data": [], "max_count": 1},
+                "recent_interactions": recent_interactions
+            }
+
+        # The four reads below are independent, so they go out concurrently:
+        # - per-discussion participation reduced server-side to a single row
+        # - all discussions, for the participation rate. We'd consider a "browsed" discussion
+        #   to be any discussion created by someone else that the user has viewed (this would
+        #   require client-side tracking, so for now we use all discussions in the system)
+        # - the activity heatmap (ideas per day)
+        # - the last 5 interaction events, labels joined server-side and response-ready
+        participation, all_discussions_count, activity_days, processed_recent_interactions = await asyncio.gather(
+            _aggregate_to_list(db.ideas, _participation_pipeline(user_id)),
+            db.discussions.estimated_document_count(),
+            _activity_by_date(db, user_id),
+            _aggregate_to_list(db.interaction_events, _recent_interactions_pipeline(user_id, 5))
+        )
+        participated_discussions_count = participation[0]["participated"] if participation else 0
+        avg_response_time = (participation[0]["avg_response_minutes"] if participation else None) or 0
         participation_rate = round((participated_discussions_count / max(all_discussions_count, 1)) * 100, 1)
         
-        # Get the user's first access time for each discussion
-        # This would ideally come from a "views" or "visits" collection that tracks when users first
-        # view a discussion, but since that's not currently implemented, we'll estimate from
-        # the created_at timestamp of discussions created by the user, and for other discussions,
-        # we'll use the first idea timestamp minus a small buffer (assuming they viewed it shortly before submitting)
-        
-        # First get discussions created by the user
-        created_discussions_cursor = db.discussions.find(
-            {"creator_id": user_id},
-            {"_id": 1, "created_at": 1}
-        ).sort([("created_at", -1)])
-        created_discussions = await created_discussions_cursor.to_list(None)
-        
-        for disc in created_discussions:
-            disc_id = str(disc["_id"])
-            if disc_id in user_discussions:
-                user_discussions[disc_id]["first_view_time"] = disc.get("created_at")
-        
-        # For discussions not created by the user, estimate view time as 5 minutes before first idea
-        for disc_id, disc_data in user_discussions.items():
-            if "first_view_time" not in disc_data and disc_data["first_idea_time"]:
-                disc_data["first_view_time"] = disc_data["first_idea_time"] - timedelta(minutes=5)
-        
-        # Calculate average response time (time between viewing and first idea)
-        response_times = []
-        for disc_data in user_discussions.values():
-            if disc_data.get("first_view_time") and disc_data.get("first_idea_time"):
-                # Calculate time difference in minutes
-                time_diff = (disc_data["first_idea_time"] - disc_data["first_view_time"]).total_seconds() / 60
-                if time_diff >= 0:  # Only include positive time differences
-                    response_times.append(time_diff)
-        
-        avg_response_time = sum(response_times) / len(response_times) if response_times else 0
-        
-        # Generate activity heatmap data (ideas per day)
-        # Group ideas by day and count
-        pipeline = [
-            {"$match": {"user_id": user_id}},
-            {"$project": {
-                "date": {"$dateToString": {"format": "%Y-%m-%d", "date": "$timestamp"}}
-            }},
-            {"$group": {
-                "_id": "$date",
-                "count": {"$sum": 1}
-            }},
-            {"$sort": {"_id": -1}}
-        ]
-        
-        activity_cursor = db.ideas.aggregate(pipeline)
-        activity_by_day = await activity_cursor.to_list(None)
-        
         # Format activity data for heatmap
         # Create a structure with year, month, day, and count
         heatmap_data = []
-        for item in activity_by_day:
+        for item in activity_days:
             try:
                 date_parts = item["_id"].split("-")
                 if len(date_parts) == 3:
@@ -322,52 +419,8 @@ async def get_current_user_engagement(
             except Exception as e:
                 logger.warning(f"Error parsing date {item['_id']}: {e}")
         
-        # Calculate max count for scaling heatmap intensity
-        max_count = max([item["count"] for item in heatmap_data]) if heatmap_data else 1
-        
-        # --- Fetch last 5 interaction events for the user ---
-        recent_interactions_cursor = db.interaction_events.find({"user_id": user_id, "actionType":{"$ne":"view"}}).sort("timestamp", -1).limit(5)
-        raw_recent_interactions_from_db = await recent_interactions_cursor.to_list(length=5)
-        
-        processed_recent_interactions = []
-        for raw_doc in raw_recent_interactions_from_db:
-            doc_for_response = {}
-            for key, value in raw_doc.items():
-                if isinstance(value, ObjectId):
-                    doc_for_response[key] = str(value)
-                elif isinstance(value, datetime): 
-                    doc_for_response[key] = value.isoformat()
-                else:
-                    doc_for_response[key] = value
-            
-            if "_id" in doc_for_response:
-                doc_for_response["id"] = doc_for_response.pop("_id")
-            
-            # Add displaytext based on entity type
-            entity_id = doc_for_response.get("entity_id")
-            entity_type = doc_for_response.get("entity_type")
-            displaytext = "Unknown"
-            
-            if entity_id and entity_type:
-                try:
-                    if entity_type == "topic":
-                        topic = await db.topics.find_one({"_id": entity_id}, {"representative_text": 1})
-                        if topic:
-                            displaytext = topic.get("representative_text", "Untitled Topic")
-                    elif entity_type == "idea":
-                        idea = await db.ideas.find_one({"_id": entity_id}, {"text": 1})
-                        if idea:
-                            displaytext = idea.get("text", "Empty idea")
-                    elif entity_type == "discussion":
-                        discussion = await db.discussions.find_one({"_id": entity_id}, {"title": 1})
-                        if discussion:
-                            displaytext = discussion.get("title", "Untitled Discussion")
-                except Exception as e:
-                    logger.warning(f"Error fetching displaytext for {entity_type} {entity_id}: {e}")
-
-            if displaytext != "Unknown":
-                doc_for_response["displaytext"] = displaytext
-                processed_recent_interactions.append(doc_for_response)
+        # Max count for scaling heatmap intensity
+        max_count = max((item["count"] for item in activity_days), default=1)
         
         # Return engagement data
         engagement_data = {
@@ -415,25 +468,16 @@ async def delete_current_user(
         db = await get_db()
 
         # 1. Get all discussions created by this user
-        user_discussions = await db.discussions.find({"creator_id": user_id}).to_list(None)
+        user_discussions = await db.discussions.find({"creator_id": user_id}, {"_id": 1}).batch_size(CURSOR_BATCH_SIZE).to_list(None)
         discussion_ids = [disc["_id"] for disc in user_discussions]
 
-        # 2. Delete all ideas in user's discussions
+        # 2-7. The cascade touches each collection independently, so the writes run concurrently.
+        # Ideas get one ordered bulk write: drop those in the user's discussions, then
+        # anonymize the rest (remove user_id but keep the content for data integrity)
+        idea_ops = []
         if discussion_ids:
-            ideas_delete_result = await db.ideas.delete_many({"discussion_id": {"$in": discussion_ids}})
-            logger.info(f"Deleted {ideas_delete_result.deleted_count} ideas from user's discussions")
-
-            # 3. Delete all topics in user's discussions
-            topics_delete_result = await db.topics.delete_many({"discussion_id": {"$in": discussion_ids}})
-            logger.info(f"Deleted {topics_delete_result.deleted_count} topics from user's discussions")
-
-            # 4. Delete user's discussions
-            discussions_delete_result = await db.discussions.delete_many({"creator_id": user_id})
-            logger.info(f"Deleted {discussions_delete_result.deleted_count} discussions")
-
-        # 5. Anonymize ideas submitted by user in other discussions
-        # Remove user_id but keep the content for data integrity
-        anonymize_result = await db.ideas.update_many(
+            idea_ops.append(DeleteMany({"discussion_id": {"$in": discussion_ids}}))
+        idea_ops.append(UpdateMany(
             {"user_id": user_id},
             {
                 "$unset": {"user_id": ""},
@@ -442,16 +486,27 @@ async def delete_current_user(
                     "verified": False
                 }
             }
-        )
-        logger.info(f"Anonymized {anonymize_result.modified_count} ideas from other discussions")
+        ))
+        cascade = [
+            db.ideas.bulk_write(idea_ops, ordered=True),
+            db.interaction_events.delete_many({"user_id": user_id}),
+            db.user_interaction_states.delete_many({"user_identifier": user_id})
+        ]
+        if discussion_ids:
+            cascade += [
+                db.topics.delete_many({"discussion_id": {"$in": discussion_ids}}),
+                db.discussions.delete_many({"creator_id": user_id})
+            ]
+        ideas_result, interactions_delete_result, states_delete_result, *discussion_results = await asyncio.gather(*cascade)
 
-        # 6. Delete user's interactions
-        interactions_delete_result = await db.interaction_events.delete_many({"user_id": user_id})
+        logger.info(f"Deleted {ideas_result.deleted_count} ideas from user's discussions")
+        logger.info(f"Anonymized {ideas_result.modified_count} ideas from other discussions")
         logger.info(f"Deleted {interactions_delete_result.deleted_count} interaction events")
-
-        # 7. Delete user's interaction states
-        states_delete_result = await db.user_interaction_states.delete_many({"user_identifier": user_id})
         logger.info(f"Deleted {states_delete_result.deleted_count} interaction states")
+        if discussion_results:
+            topics_delete_result, discussions_delete_result = discussion_results
+            logger.info(f"Deleted {topics_delete_result.deleted_count} topics from user's discussions")
+            logger.info(f"Deleted {discussions_delete_result.deleted_count} discussions")
 
         # 8. Delete the user account
         user_delete_result = await db.users.delete_one({"_id": user_id})
@@ -463,7 +518,8 @@ async def delete_current_user(
                 detail="User not found"
             )
 
-        # 9. Clear authentication cookies
+        # 9. Clear authentication cookies (and the cached session behind them)
+        invalidate_user_sessions(user_id)
         cookie_domain = None
         if settings.ENVIRONMENT != "development":
             cookie_domain = settings.COOKIE_DOMAIN
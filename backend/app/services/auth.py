@@ -4,21 +4,45 @@ Authentication and authorization service for TopicTrends.
 
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any, Annotated
-from jose import JWTError, jwt
+import jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status, Cookie, Request, Response, Header
 from fastapi.security import OAuth2PasswordBearer
 import secrets
-import string
+import base64
+import os
+import hashlib
+import hmac
+import time
 import logging
+import asyncio
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
 from app.core.config import settings
 from app.core.database import get_db
+from pymongo import ReturnDocument, DeleteMany, InsertOne
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing: argon2id for new hashes; existing bcrypt hashes still verify
+# and are upgraded on the user's next successful login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
+)
+# Hashing is CPU-bound, so it gets its own pool sized to the cores: a burst of logins
+# can't take over the default thread pool that sync dependencies and file I/O share
+_HASH_POOL = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="pwd-hash")
+# Longest password accepted anywhere (see user_schemas); longer input is rejected before hashing
+MAX_PASSWORD_LENGTH = 256
+# Verified against when the email is unknown, so a miss costs the same as a wrong password
+_DUMMY_HASH = pwd_context.hash(secrets.token_urlsafe(16))
 
 # JWT token settings
 SECRET_KEY = settings.SECRET_KEY
@@ -31,6 +55,58 @@ PT_SECRET_KEY = settings.PARTICIPATION_TOKEN_SECRET_KEY
 PT_ALGORITHM = settings.PARTICIPATION_TOKEN_ALGORITHM
 PT_EXPIRE_MINUTES = settings.PARTICIPATION_TOKEN_EXPIRE_MINUTES
 
+# --- HS256 token codec ---
+def _b64url_encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+def _json_default(value: Any):
+    if isinstance(value, datetime):
+        return int(value.timestamp())  # NumericDate, as PyJWT would emit
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class _HS256Codec:
+    """
+    Signs HS256 JWTs for one secret. The keyed HMAC state (padded key, ipad/opad) is
+    built once and copied per token, and the header never changes so its encoding is
+    cached. Verification stays with PyJWT (see _decode_jwt_payload).
+    """
+    HEADER = _b64url_encode(orjson.dumps({"alg": "HS256", "typ": "JWT"}))
+
+    def __init__(self, secret: str):
+        self._hmac = hmac.new(secret.encode(), digestmod=hashlib.sha256)
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        mac = self._hmac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def encode(self, payload: Dict[str, Any]) -> str:
+        # Datetimes are passed through to _json_default so they become NumericDates, not RFC 3339
+        body = orjson.dumps(payload, default=_json_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        signing_input = self.HEADER + b"." + _b64url_encode(body)
+        return (signing_input + b"." + _b64url_encode(self._sign(signing_input))).decode()
+
+_hs256_codecs: Dict[str, _HS256Codec] = {}
+
+def _codec_for(secret: str, algorithm: str) -> Optional[_HS256Codec]:
+    """The precomputed signer for HS256 secrets; None sends other algorithms through PyJWT."""
+    if algorithm != "HS256":
+        return None
+    codec = _hs256_codecs.get(secret)
+    if codec is None:
+        codec = _hs256_codecs[secret] = _HS256Codec(secret)
+    return codec
+
+def _encode_jwt(payload: Dict[str, Any], secret: str, algorithm: str) -> str:
+    codec = _codec_for(secret, algorithm)
+    if codec is not None:
+        return codec.encode(payload)
+    return jwt.encode(payload, secret, algorithm=algorithm)
+
+def _decode_jwt_payload(token: str, secret: str, algorithms: list[str], require: tuple) -> Dict[str, Any]:
+    # Always verified by PyJWT: strict base64, exp/nbf/iat checks and claim type validation
+    return jwt.decode(token, secret, algorithms=algorithms, options={"require": list(require)})
+
 # CSRF settings
 CSRF_SECRET_KEY = settings.CSRF_SECRET_KEY 
 CSRF_COOKIE_NAME = "csrftoken"
@@ -39,6 +115,22 @@ CSRF_TOKEN_BYTES = 32
 
 # API Key settings
 ALLOWED_API_KEYS = settings.ALLOWED_API_KEYS 
+# Keyed fingerprints of the allowed keys: a presented key is checked with one hash and a
+# set lookup instead of a compare against every key. The server-side key means the
+# fingerprints can't be precomputed from guessed API keys.
+_API_KEY_HASH_KEY = hashlib.blake2b(CSRF_SECRET_KEY.encode(), digest_size=32).digest()
+
+def _api_key_fingerprint(api_key: str) -> bytes:
+    return hashlib.blake2b(api_key.encode(), key=_API_KEY_HASH_KEY, digest_size=32).digest()
+
+_API_KEY_HASH_SET: frozenset = frozenset(_api_key_fingerprint(key) for key in ALLOWED_API_KEYS)
+
+# Verified session cache: dashboards fire several authenticated requests at once,
+# so the JWT decode + user lookup is memoized per cookie for a few seconds
+_session_cache: TTLCache = TTLCache(maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+# user_id -> cache keys of that user's sessions, so profile/password changes can drop them all;
+# same size and TTL as the session cache, since an entry is only useful while its sessions are cached
+_session_keys_by_user: TTLCache = TTLCache(maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS)
 
 # --- Exceptions ---
 credentials_exception = HTTPException(
@@ -58,31 +150,49 @@ api_key_exception = HTTPException(
 # Token dependency
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login") 
 
-def verify_password(plain_password, hashed_password):
+# Hashing is deliberately slow, so it runs on _HASH_POOL to keep the event loop serving
+async def verify_password(plain_password, hashed_password):
     """Verify password against hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_HASH_POOL, pwd_context.verify, plain_password, hashed_password)
+
+async def verify_and_update_password(plain_password, hashed_password):
+    """Verify password against hash, returning (valid, new_hash) when the hash needs upgrading"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_HASH_POOL, pwd_context.verify_and_update, plain_password, hashed_password)
 
-def get_password_hash(password):
+async def get_password_hash(password):
     """Generate password hash"""
-    return pwd_context.hash(password)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_HASH_POOL, pwd_context.hash, password)
 
-async def get_user_by_email(email: str):
+# Projections for user lookups: callers fetch only what they read. Sessions get the
+# whole profile minus credentials, which also keeps hashes out of the session cache.
+LOGIN_USER_PROJECTION = {"_id": 1, "email": 1, "username": 1, "password": 1, "is_verified": 1, "is_active": 1}
+SESSION_USER_PROJECTION = {"password": 0, "verification_code": 0}
+
+async def get_user_by_email(email: str, projection: Optional[Dict[str, int]] = None):
     """Retrieve user by email"""
     db = await get_db()
-    logger.info(f"Looking up user by email: {email}") 
-    return await db.users.find_one({"email": email.lower()})
+    logger.debug("Looking up user by email: %s", email)
+    return await db.users.find_one({"email": email.lower()}, projection)
 
-async def get_user_by_id(user_id: str):
+async def get_user_by_id(user_id: str, projection: Optional[Dict[str, int]] = None):
     """Retrieve user by ID"""
     db = await get_db()
-    return await db.users.find_one({"_id": user_id})
+    return await db.users.find_one({"_id": user_id}, projection)
+
+def generate_verification_code(length: int = 6) -> str:
+    """Random A-Z/2-7 email verification code (one urandom read, base32 encoded)"""
+    # base32 carries 5 bits per character, so read just enough bytes for `length`
+    return base64.b32encode(os.urandom((length * 5 + 7) // 8)).decode()[:length]
 
 async def create_user(user_data: dict):
     """Create a new user"""
     db = await get_db()
 
-    verification_code = ''.join(secrets.choice(string.ascii_uppercase + string.digits) for _ in range(6))
-    hashed_password = get_password_hash(user_data["password"])
+    verification_code = generate_verification_code()
+    hashed_password = await get_password_hash(user_data["password"])
     now = datetime.now(timezone.utc)
 
     user_doc = {
@@ -117,40 +227,55 @@ async def update_user_profile(user_id: str, update_data: Dict[str, Any]):
         {"$set": update_data}
     )
     logger.info(f"Profile update attempted for user {user_id}. Modified count: {result.modified_count}")
+    invalidate_user_sessions(user_id)
     return result.modified_count > 0
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
-    to_encode = data.copy()
-
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    lifetime = expires_delta.total_seconds() if expires_delta else ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    # exp as a NumericDate int straight from the clock, so no datetime round-trip per token
+    encoded_jwt = _encode_jwt({**data, "exp": int(time.time() + lifetime)}, SECRET_KEY, ALGORITHM)
 
     return encoded_jwt
 
 async def _decode_jwt(token: str, secret: str, algorithms: list[str]):
     """Internal helper to decode JWT"""
     try:
-        payload = jwt.decode(token, secret, algorithms=algorithms)
+        payload = _decode_jwt_payload(token, secret, algorithms, ("exp", "sub"))
         return payload
     except jwt.ExpiredSignatureError:
         logger.info("Token expired.")
         raise credentials_exception # Re-use 401 for expired tokens
-    except jwt.JWTError as e:
+    except jwt.PyJWTError as e:
         logger.warning(f"Token validation failed: {e}")
         raise credentials_exception
 
-# Cookie-based token verification
-async def verify_token_cookie(access_token: Annotated[str | None, Cookie()] = None) -> dict:
-    """Verify JWT token from cookie and return user dict from DB."""
-    if not access_token:
-        # logger.debug("Verify token cookie: No access_token cookie found.")
-        raise credentials_exception
+def _session_cache_key(token: str) -> bytes:
+    """Fixed-size cache key so raw tokens are never held in memory as keys."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+def invalidate_session_cache(token: Optional[str]) -> None:
+    """Drop a token from the verified session cache (e.g. on logout)."""
+    if token:
+        _session_cache.pop(_session_cache_key(token), None)
+
+def invalidate_user_sessions(user_id: str) -> None:
+    """Drop every cached session of a user (after their profile, password or account changes)."""
+    for cache_key in _session_keys_by_user.pop(user_id, ()):
+        _session_cache.pop(cache_key, None)
+
+async def _get_session_user(access_token: str) -> dict:
+    """Resolve a session cookie to its user, via the verified session cache."""
+    cache_key = _session_cache_key(access_token)
+    cached = _session_cache.get(cache_key)
+    if cached is not None:
+        cached_user, expires_at = cached
+        # The cache TTL can outlive the token itself; honour the JWT's exp
+        if expires_at is not None and expires_at <= time.time():
+            _session_cache.pop(cache_key, None)
+            logger.info("Token expired.")
+            raise credentials_exception
+        return dict(cached_user)
 
     payload = await _decode_jwt(access_token, SECRET_KEY, [ALGORITHM])
     user_id: str = payload.get("sub")
@@ -158,77 +283,103 @@ async def verify_token_cookie(access_token: Annotated[str | None, Cookie()] = No
         logger.warning("Token payload missing 'sub' (user_id).")
         raise credentials_exception
 
-    user = await get_user_by_id(user_id)
+    user = await get_user_by_id(user_id, SESSION_USER_PROJECTION)
     if user is None:
         logger.warning(f"User not found for token sub: {user_id}")
         raise credentials_exception
 
-    return user 
+    _session_cache[cache_key] = (user, payload.get("exp"))
+    # Drop keys the session cache has since evicted before adding this one
+    user_keys = {key for key in _session_keys_by_user.get(user_id, ()) if key in _session_cache}
+    user_keys.add(cache_key)
+    _session_keys_by_user[user_id] = user_keys
+    return dict(user)
+
+# Cookie-based token verification
+async def verify_token_cookie(access_token: Annotated[str | None, Cookie()] = None) -> dict:
+    """Verify JWT token from cookie and return user dict from DB."""
+    if not access_token:
+        # logger.debug("Verify token cookie: No access_token cookie found.")
+        raise credentials_exception
+
+    return await _get_session_user(access_token)
 
 async def authenticate_user(email: str, password: str):
     """Authenticate user with email and password"""
+    if not password or len(password) > MAX_PASSWORD_LENGTH:
+        return None
     # Convert email to lowercase before lookup
-    user = await get_user_by_email(email.lower())
+    user = await get_user_by_email(email.lower(), LOGIN_USER_PROJECTION)
     if not user:
+        # Same hashing work as a real check, so response time doesn't reveal registered emails
+        await verify_password(password, _DUMMY_HASH)
         return None
-    if not verify_password(password, user["password"]):
+    valid, new_hash = await verify_and_update_password(password, user["password"])
+    if not valid:
         return None
+    if new_hash:
+        db = await get_db()
+        await db.users.update_one({"_id": user["_id"]}, {"$set": {"password": new_hash}})
+        user["password"] = new_hash
+        logger.info(f"Upgraded password hash for user {user['_id']}")
     return user
 
 async def verify_user(email: str, code: str):
     """Verify user's email with verification code"""
     db = await get_db()
-    # Convert email to lowercase for the query
-    user = await db.users.find_one({
-        "email": email.lower(),
-        "verification_code": code,
-        "is_verified": False 
-    })
+    # Match and redeem in one atomic step so a code can only be used once
+    user = await db.users.find_one_and_update(
+        {
+            "email": email.lower(),
+            "verification_code": code,
+            "is_verified": False
+        },
+        {
+            "$set": {
+                "is_verified": True,
+                "modified_at": datetime.now(timezone.utc)
+            },
+            "$unset": {"verification_code": ""}
+        },
+        projection={"_id": 1}
+    )
 
     if user:
-        # User found and code matches, update verification status
-        result = await db.users.update_one(
-            {"_id": user["_id"]},
-            {
-                "$set": {
-                    "is_verified": True,
-                    "modified_at": datetime.now(timezone.utc)
-                },
-                "$unset": {"verification_code": ""}
-            }
-        )
         logger.info(f"User email verified: {email}")
-        return result.modified_count > 0
+        return True
     logger.warning(f"Verification failed for email {email} with code {code}")
     return False
 
 async def create_password_reset_token(user_id: str) -> str:
     """Create a password reset token"""
-    expire = datetime.now(timezone.utc) + timedelta(minutes=RESET_TOKEN_EXPIRE_MINUTES)
+    now = datetime.now(timezone.utc)
+    expire = now + timedelta(minutes=RESET_TOKEN_EXPIRE_MINUTES)
     to_encode = {
         "sub": user_id,
         "type": "password_reset",
-        "exp": expire
+        "exp": int(expire.timestamp())
     }
-    encoded_token = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_token = _encode_jwt(to_encode, SECRET_KEY, ALGORITHM)
 
     # Store token hash in database for verification
     db = await get_db()
     token_data = {
         "user_id": user_id,
         "token": encoded_token, 
-        "created_at": datetime.now(timezone.utc),
+        "created_at": now,
         "expires_at": expire,
         "used": False
     }
-    # Remove old, unused tokens for the same user before inserting new one
-    await db.password_reset_tokens.delete_many({"user_id": user_id, "used": False})
-    await db.password_reset_tokens.insert_one(token_data)
+    # Remove old, unused tokens for the same user before inserting new one (one ordered round-trip)
+    await db.password_reset_tokens.bulk_write([
+        DeleteMany({"user_id": user_id, "used": False}),
+        InsertOne(token_data)
+    ], ordered=True)
     logger.info(f"Password reset token created for user {user_id}")
     return encoded_token
 
 async def verify_password_reset_token(email: str, token: str) -> Optional[str]:
-    """Verify a password reset token and return the user ID if valid"""
+    """Verify and consume a password reset token, returning the user ID if valid"""
     db = await get_db()
 
     try:
@@ -241,24 +392,30 @@ async def verify_password_reset_token(email: str, token: str) -> Optional[str]:
             logger.warning(f"Invalid token format for password reset: {payload}")
             return None
 
-        # Check token in database
-        token_record = await db.password_reset_tokens.find_one({
-            "token": token, 
-            "user_id": user_id,
-            "used": False,
-            "expires_at": {"$gt": datetime.now(timezone.utc)} 
-        })
-
-        if not token_record:
-            logger.warning(f"Password reset token not found, expired, or used: {token[:10]}...")
-            return None
-
          # Verify the email matches the user
-        user = await get_user_by_id(user_id)
+        user = await get_user_by_id(user_id, {"email": 1})
         if not user or user["email"].lower() != email.lower():
             logger.warning(f"Token user ID {user_id} email does not match provided email {email}")
             return None
 
+        # Check and consume the token in one atomic step, so it can't be redeemed twice
+        now = datetime.now(timezone.utc)
+        token_record = await db.password_reset_tokens.find_one_and_update(
+            {
+                "token": token, 
+                "user_id": user_id,
+                "used": False,
+                "expires_at": {"$gt": now} 
+            },
+            {"$set": {"used": True, "used_at": now}},
+            projection={"_id": 1},
+            return_document=ReturnDocument.AFTER
+        )
+
+        if not token_record:
+            logger.warning(f"Password reset token not found, expired, or used: {token[:10]}...")
+            return None
+
         logger.info(f"Password reset token verified for user {user_id}")
         return user_id
 
@@ -277,7 +434,8 @@ async def reset_user_password(user_id: str, new_password: str) -> bool:
     
     try:
         # Hash the new password
-        hashed_password = get_password_hash(new_password)
+        hashed_password = await get_password_hash(new_password)
+        now = datetime.now(timezone.utc)
         
         # Update user password
         result = await db.users.update_one(
@@ -285,7 +443,7 @@ async def reset_user_password(user_id: str, new_password: str) -> bool:
             {
                 "$set": {
                     "password": hashed_password,
-                    "modified_at": datetime.now(timezone.utc)
+                    "modified_at": now
                 }
             }
         )
@@ -293,16 +451,10 @@ async def reset_user_password(user_id: str, new_password: str) -> bool:
         if result.modified_count == 0:
             logger.warning(f"Failed to update password for user {user_id}")
             return False
+        invalidate_user_sessions(user_id)
 
-        # Mark the specific token used as 'used'
-        # Finding the token again might be needed if not passed directly
-        # For now, assume the verification step happened just before this.
-        # It's safer to mark *all* valid tokens for the user as used upon successful reset.
-        update_tokens_result = await db.password_reset_tokens.update_many(
-            {"user_id": user_id, "used": False, "expires_at": {"$gt": datetime.now(timezone.utc)}},
-            {"$set": {"used": True}}
-        )
-        logger.info(f"Marked {update_tokens_result.modified_count} password reset tokens as used for user {user_id}")
+        # The token itself was consumed by verify_password_reset_token, and issuing a
+        # token revokes the user's older unused ones, so there is nothing left to mark
         logger.info(f"Password reset successful for user {user_id}")
         return True
 
@@ -312,8 +464,12 @@ async def reset_user_password(user_id: str, new_password: str) -> bool:
 
 # --- NEW CSRF Functions ---
 def generate_csrf_token() -> str:
-    """Generates a secure random CSRF token."""
-    return secrets.token_hex(CSRF_TOKEN_BYTES)
+    """Generates a secure random CSRF token (base64url, 43 chars for 32 bytes)."""
+    return secrets.token_urlsafe(CSRF_TOKEN_BYTES)
+
+def _csrf_tokens_match(csrf_token_cookie: str, csrf_token_header: str) -> bool:
+    """Constant-time comparison on the raw bytes (str inputs must be ASCII, bytes need not be)."""
+    return hmac.compare_digest(csrf_token_cookie.encode(), csrf_token_header.encode())
 
 async def verify_csrf_dependency(
     request: Request,
@@ -332,7 +488,7 @@ async def verify_csrf_dependency(
         logger.warning(f"CSRF check failed: Missing cookie ({bool(csrf_token_cookie)}) or header ({bool(csrf_token_header)}) for {request.method} {request.url.path}")
         raise csrf_exception
 
-    if not secrets.compare_digest(csrf_token_cookie, csrf_token_header):
+    if not _csrf_tokens_match(csrf_token_cookie, csrf_token_header):
         logger.warning(f"CSRF check failed: Token mismatch for {request.method} {request.url.path}")
         raise csrf_exception
     # logger.debug(f"CSRF check passed for {request.method} {request.url.path}") # Reduce noise
@@ -346,14 +502,8 @@ async def verify_api_key(
         logger.warning("API Key check failed: Missing X-API-Key header.")
         raise api_key_exception
 
-    # Use compare_digest for potentially sensitive keys, though timing attacks less likely here
-    valid_key = False
-    for key in ALLOWED_API_KEYS:
-        if secrets.compare_digest(x_api_key, key):
-            valid_key = True
-            break
-
-    if not valid_key:
+    # Lookups are by keyed hash, so timing reveals nothing about the stored keys themselves
+    if _api_key_fingerprint(x_api_key) not in _API_KEY_HASH_SET:
         logger.warning(f"API Key check failed: Invalid key provided: {x_api_key[:5]}...") # Log prefix only
         raise api_key_exception
 
@@ -366,27 +516,27 @@ def create_participation_token(discussion_id: str, anonymous_user_id: str) -> st
     to_encode = {
         "discussion_id": discussion_id,
         "anon_user_id": anonymous_user_id,
-        "exp": expire,
+        "exp": int(expire.timestamp()),
         "sub": anonymous_user_id,  # Subject can be the anonymous ID
         "type": "participation"  # Distinguish from auth tokens
     }
-    encoded_jwt = jwt.encode(to_encode, PT_SECRET_KEY, algorithm=PT_ALGORITHM)
+    encoded_jwt = _encode_jwt(to_encode, PT_SECRET_KEY, PT_ALGORITHM)
     return encoded_jwt
 
 def verify_participation_token(token: str) -> dict | None:
     """Verifies the participation token. Returns payload dict or None."""
     try:
-        # Use options={"require": ["exp", "sub", "type", "discussion_id", "anon_user_id"]} ?
-        # decode already checks expiry if present. require_exp ensures it IS present.
-        payload = jwt.decode(
+        # decode already checks expiry if present; "require" ensures it and the
+        # participation claims ARE present (missing ones raise a PyJWTError)
+        payload = _decode_jwt_payload(
             token,
             PT_SECRET_KEY,
-            algorithms=[PT_ALGORITHM],
-            options={"require_exp": True}
+            [PT_ALGORITHM],
+            ("exp", "sub", "type", "discussion_id", "anon_user_id")
         )
-        if payload.get("type") != "participation" or \
-           not payload.get("discussion_id") or \
-           not payload.get("anon_user_id"):
+        if payload["type"] != "participation" or \
+           not payload["discussion_id"] or \
+           not payload["anon_user_id"]:
             logger.warning("Participation token invalid type or missing required fields.")
             return None
         # logger.debug("Participation token verified successfully.") # Reduce noise
@@ -394,7 +544,7 @@ def verify_participation_token(token: str) -> dict | None:
     except jwt.ExpiredSignatureError:
         logger.info("Participation token expired.")
         return None
-    except jwt.JWTError as e:
+    except jwt.PyJWTError as e:
         logger.warning(f"Participation token validation failed: {e}")
         return None
 
@@ -411,7 +561,7 @@ async def check_csrf_manual(request: Request):
         logger.warning(f"Manual CSRF check failed: Missing cookie or header for {request.method} {request.url.path}")
         raise csrf_exception
 
-    if not secrets.compare_digest(csrf_token_cookie, csrf_token_header):
+    if not _csrf_tokens_match(csrf_token_cookie, csrf_token_header):
         logger.warning(f"Manual CSRF check failed: Token mismatch for {request.method} {request.url.path}")
         raise csrf_exception
     # logger.debug(f"Manual CSRF check passed for {request.method} {request.url.path}") # Reduce noise
@@ -432,18 +582,7 @@ async def get_optional_current_user(
         return None
         
     try:
-        payload = await _decode_jwt(access_token, SECRET_KEY, [ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            logger.warning("Token payload missing 'sub' (user_id).")
-            return None
-            
-        user = await get_user_by_id(user_id)
-        if user is None:
-            logger.warning(f"User not found for token sub: {user_id}")
-            return None
-            
-        return user
+        return await _get_session_user(access_token)
         
     except HTTPException:
         return None
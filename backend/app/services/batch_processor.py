@@ -10,21 +10,22 @@ Optimizations:
 """
 
 import asyncio
+import hashlib
 import logging
-import json
+import orjson
 import time
 import numpy as np
 from datetime import datetime, timedelta
 from typing import List, Dict, Set, Optional
 from collections import defaultdict
-import weakref
+from cachetools import TTLCache
+from pymongo import UpdateOne
 
 from app.core.database import get_db
 from app.core.redis import get_redis
 from app.core.socketio import sio
 from app.models.schemas import IdeaStatus
 from app.services.genkit.flows.format_idea import format_idea
-from app.services.genkit.embedders.idea_embedder import embed_ideas
 from app.services.clustering_coordinator import ClusteringCoordinator
 
 logger = logging.getLogger(__name__)
@@ -32,108 +33,188 @@ logger = logging.getLogger(__name__)
 # Scalable processing configuration
 MEGA_BATCH_SIZE = 2000  # Process 2000 ideas at once
 PARALLEL_AI_CALLS = 50  # 50 concurrent embedding calls
+EMBEDDING_CHUNK_SIZE = 32  # Texts sent per embedding request
 BATCH_TIMEOUT_MS = 50   # Fast processing
 WEBSOCKET_THROTTLE_MS = 100  # Responsive updates
 MAX_CONCURRENT_BATCHES = 20  # High concurrency
+SHUTDOWN_DRAIN_TIMEOUT_SECONDS = 30  # How long stop() lets running batches finish
 MAX_WEBSOCKET_QUEUE_SIZE = 1000  # Memory limit
 MEMORY_LIMIT_MB = 100   # 100MB memory limit per batch
 AI_RATE_LIMIT_PER_SECOND = 100  # AI API rate limit
+DISCUSSION_LOCAL_CACHE_TTL_SECONDS = 60  # In-process tier in front of the 5 minute Redis discussion cache
 
 # Redis queue keys
 IDEA_BATCH_QUEUE = "idea_batch_queue"
 PROCESSING_BATCH_SET = "processing_batch_set"
 WEBSOCKET_QUEUE_PREFIX = "ws_queue:"
+CLEANUP_SCAN_COUNT = 500  # Keys per SCAN step and per pipelined TTL/EXPIRE round-trip
+
+# Idea fields sent to clients over WebSocket (mirrors the frontend Idea interface)
+CLIENT_IDEA_FIELDS = (
+    'text', 'user_id', 'verified', 'timestamp', 'topic_id', 'discussion_id', 'submitter_display_id',
+    'status', 'intent', 'keywords', 'sentiment', 'specificity', 'related_topics', 'on_topic',
+    'average_rating', 'rating_count', 'rating_distribution'
+)
+CLIENT_IDEA_DATETIME_FIELDS = ('timestamp',)
+
+# Fields the clustering stage changes on an idea that is already stored
+CLUSTERED_IDEA_FIELDS = ('status', 'topic_id', 'updated_at')
+
+# Fields filled in by format_idea and saved alongside the embedding
+AI_IDEA_FIELDS = ('intent', 'keywords', 'sentiment', 'specificity', 'related_topics', 'on_topic')
+
+def _is_embeddable(text) -> bool:
+    return isinstance(text, str) and bool(text.strip())
+
+def _text_key(text, fallback):
+    """Dedup key for an idea's text (16-byte blake2b); non-text values get the unique fallback"""
+    if isinstance(text, str):
+        return hashlib.blake2b(text.encode(), digest_size=16).digest()
+    return fallback
 
 class ParallelEmbeddingProcessor:
     """Parallel AI processing for 25x speed improvement"""
 
     def __init__(self, max_concurrent: int = PARALLEL_AI_CALLS):
         self.embedding_semaphore = asyncio.Semaphore(max_concurrent)
-        self.last_ai_call = 0
+        self.next_ai_call_at = 0.0  # time.monotonic() of the next free rate-limit slot
         self.db = None
 
-    async def embed_ideas_parallel(self, ideas: List[Dict]) -> List[Dict]:
-        """Process embeddings in true parallel with rate limiting"""
+    async def embed_ideas_parallel(self, ideas: List[Dict], format_fn=None) -> List[Dict]:
+        """Process embeddings in true parallel with rate limiting.
+
+        Ideas are embedded EMBEDDING_CHUNK_SIZE texts per request, and identical texts in the
+        batch are sent once and share the vector. If format_fn is given, each idea is formatted by
+        it concurrently with its chunk's embedding call (both only read the text) and the
+        formatted copy is what gets embedded and saved. Results keep the input order.
+        """
 
         # Initialize database connection if not already done
         if self.db is None:
             from app.core.database import get_db
             self.db = await get_db()
 
-        async def embed_single_with_limit(idea):
+        # Embedding results are written back in one bulk_write once the batch finishes
+        pending_updates = []
+        results = list(ideas)
+
+        # Positions of ideas sharing a text; each group costs one slot in an embedding request
+        text_groups: Dict[object, List[int]] = {}
+        for position, idea in enumerate(ideas):
+            text_groups.setdefault(_text_key(idea.get('text'), position), []).append(position)
+
+        async def embed_chunk_with_limit(chunk_groups):
             async with self.embedding_semaphore:
+                # Blank texts can't be embedded; keep them out of the request
+                embeddable = [i for i, group in enumerate(chunk_groups) if _is_embeddable(ideas[group[0]].get('text'))]
                 try:
-                    # Update last_attempt timestamp when starting
-                    await self.db.ideas.update_one(
-                        {"_id": idea["_id"]},
-                        {"$currentDate": {"last_attempt": True}}
-                    )
-
-                    # Rate limiting
-                    await self._enforce_rate_limit()
-
-                    # Get embedding with retry logic for 429 errors
-                    from app.services.genkit.embedders.idea_embedder import embed_idea
-
-                    max_retries = 3
-                    base_delay = 1.0
-
-                    for attempt in range(max_retries):
-                        try:
-                            embedding = await embed_idea(idea['text'])
-                            idea['embedding'] = embedding
-
-                            # Update database with successful embedding AND all AI fields
-                            update_fields = {
-                                "embedding": embedding,
-                                "status": "embedded"  # Use 'status' and set to 'embedded' for consistency
-                            }
-
-                            # Include all AI-generated fields if they exist
-                            ai_fields = ['intent', 'keywords', 'sentiment', 'specificity', 'related_topics', 'on_topic']
-                            for field in ai_fields:
-                                if field in idea:
-                                    update_fields[field] = idea[field]
-
-                            await self.db.ideas.update_one(
-                                {"_id": idea["_id"]},
-                                {"$set": update_fields}
-                            )
-
-                            return idea
-
-                        except Exception as embed_error:
-                            error_str = str(embed_error)
-
-                            # Check if it's a 429 rate limit error
-                            if "429" in error_str or "Too Many Requests" in error_str:
-                                if attempt < max_retries - 1:
-                                    # Exponential backoff for rate limits
-                                    delay = base_delay * (2 ** attempt)
-                                    logger.warning(f"Rate limit hit for idea {idea['_id']}, retrying in {delay}s (attempt {attempt + 1}/{max_retries})")
-                                    await asyncio.sleep(delay)
-                                    continue
-                                else:
-                                    logger.error(f"Rate limit exceeded for idea {idea['_id']} after {max_retries} attempts")
-                            else:
-                                # Non-rate-limit error, don't retry
-                                logger.error(f"Embedding failed for {idea['_id']}: {embed_error}")
-                                break
-
-                    # If we get here, all retries failed or it was a non-retryable error
-                    return idea  # Return without embedding
-
+                    embed_call = self._embed_chunk([ideas[chunk_groups[i][0]] for i in embeddable]) if embeddable else asyncio.sleep(0, [])
+                    if format_fn is not None:
+                        positions = [position for group in chunk_groups for position in group]
+                        formatted, chunk_embeddings = await asyncio.gather(
+                            asyncio.gather(*[format_fn(ideas[position]) for position in positions]),
+                            embed_call
+                        )
+                        for position, formatted_idea in zip(positions, formatted):
+                            results[position] = formatted_idea
+                    else:
+                        chunk_embeddings = await embed_call
                 except Exception as e:
-                    logger.error(f"Unexpected error processing idea {idea['_id']}: {e}")
-                    return idea  # Return without embedding
+                    logger.error(f"Unexpected error processing embedding chunk of {len(chunk_groups)} texts: {e}")
+                    return  # Leave these ideas without embeddings
+
+                for i, embedding in zip(embeddable, chunk_embeddings):
+                    if embedding is None:
+                        continue
+                    for position in chunk_groups[i]:
+                        idea = results[position]
+                        idea['embedding'] = embedding
+
+                        # Update database with successful embedding AND all AI fields
+                        update_fields = {
+                            "embedding": embedding,
+                            "status": "embedded"  # Use 'status' and set to 'embedded' for consistency
+                        }
+
+                        # Include all AI-generated fields if they exist
+                        for field in AI_IDEA_FIELDS:
+                            if field in idea:
+                                update_fields[field] = idea[field]
+
+                        pending_updates.append(UpdateOne(
+                            {"_id": idea["_id"]},
+                            {"$set": update_fields}
+                        ))
+
+        # Stamp last_attempt for the whole batch in one round-trip before embedding starts
+        if ideas:
+            await self.db.ideas.update_many(
+                {"_id": {"$in": [idea["_id"] for idea in ideas]}},
+                {"$currentDate": {"last_attempt": True}}
+            )
 
-        # Process ALL ideas in parallel (limited by semaphore)
-        embedded_ideas = await asyncio.gather(
-            *[embed_single_with_limit(idea) for idea in ideas],
+        # Process ALL chunks in parallel (limited by semaphore), one embedding request each
+        groups = list(text_groups.values())
+        await asyncio.gather(
+            *[embed_chunk_with_limit(groups[i:i + EMBEDDING_CHUNK_SIZE]) for i in range(0, len(groups), EMBEDDING_CHUNK_SIZE)],
             return_exceptions=True
         )
 
-        return [idea for idea in embedded_ideas if not isinstance(idea, Exception)]
+        if pending_updates:
+            try:
+                await self.db.ideas.bulk_write(pending_updates, ordered=False)
+            except Exception as e:
+                logger.error(f"Bulk embedding save failed for {len(pending_updates)} ideas: {e}")
+
+        return results
+
+    async def _embed_chunk(self, ideas: List[Dict]) -> List[Optional[List[float]]]:
+        """Embed ideas in one request, aligned with the input (None where an idea can't be embedded).
+
+        A chunk that fails for a reason other than rate limiting is split in half and retried,
+        so one bad text doesn't cost the rest of the chunk its embeddings.
+        """
+        try:
+            return await self._embed_with_retry(ideas)
+        except Exception as embed_error:
+            if len(ideas) == 1:
+                logger.error(f"Embedding failed for {ideas[0]['_id']}: {embed_error}")
+                return [None]
+            middle = len(ideas) // 2
+            left, right = await asyncio.gather(self._embed_chunk(ideas[:middle]), self._embed_chunk(ideas[middle:]))
+            return left + right
+
+    async def _embed_with_retry(self, ideas: List[Dict]) -> List[Optional[List[float]]]:
+        """Embed a chunk, backing off on 429s. Non-rate-limit errors are raised to the caller."""
+        # Rate limiting
+        await self._enforce_rate_limit()
+
+        # Get embeddings with retry logic for 429 errors
+        from app.services.genkit.embedders.idea_embedder import embed_texts
+
+        max_retries = 3
+        base_delay = 1.0
+
+        for attempt in range(max_retries):
+            try:
+                return await embed_texts([idea['text'] for idea in ideas])
+
+            except Exception as embed_error:
+                error_str = str(embed_error)
+
+                # Non-rate-limit error, don't retry here
+                if "429" not in error_str and "Too Many Requests" not in error_str:
+                    raise
+
+                if attempt < max_retries - 1:
+                    # Exponential backoff for rate limits
+                    delay = base_delay * (2 ** attempt)
+                    logger.warning(f"Rate limit hit for {len(ideas)} ideas, retrying in {delay}s (attempt {attempt + 1}/{max_retries})")
+                    await asyncio.sleep(delay)
+
+        # All retries were rate limited; leave the chunk for the unprocessed ideas sweep
+        logger.error(f"Rate limit exceeded for {len(ideas)} ideas after {max_retries} attempts")
+        return [None] * len(ideas)
 
     async def process_ideas_for_embedding(self, ideas: List[Dict]):
         """Process specific ideas for embedding generation (used by unprocessed ideas service)"""
@@ -157,15 +238,16 @@ class ParallelEmbeddingProcessor:
 
     async def _enforce_rate_limit(self):
         """Enforce AI API rate limiting"""
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_ai_call
         min_interval = 1.0 / AI_RATE_LIMIT_PER_SECOND
 
-        if time_since_last_call < min_interval:
-            sleep_time = min_interval - time_since_last_call
-            await asyncio.sleep(sleep_time)
+        # Reserve the next free slot before awaiting anything: there is no await between the
+        # read and the write, so concurrent callers each get their own slot, spaced min_interval apart
+        now = time.monotonic()
+        slot = max(now, self.next_ai_call_at)
+        self.next_ai_call_at = slot + min_interval
 
-        self.last_ai_call = time.time()
+        if slot > now:
+            await asyncio.sleep(slot - now)
 
 # VectorizedClustering class removed - now using ClusteringCoordinator for Real-Time Engine
 class OptimizedDatabase:
@@ -174,8 +256,12 @@ class OptimizedDatabase:
     def __init__(self):
         self.connection_pool = None
 
-    async def bulk_save_optimized(self, ideas: List[Dict]):
-        """Optimized bulk operations with connection reuse"""
+    async def bulk_save_optimized(self, ideas: List[Dict], fields: Optional[tuple] = None):
+        """Optimized bulk operations with connection reuse.
+
+        With fields, only those keys are $set on existing ideas (no upsert, so a partial
+        document is never inserted); without, the whole idea is upserted.
+        """
         if not ideas:
             return
 
@@ -185,13 +271,17 @@ class OptimizedDatabase:
         bulk_operations = []
 
         for idea in ideas:
-            bulk_operations.append({
-                "update_one": {
-                    "filter": {"_id": idea["_id"]},
-                    "update": {"$set": idea},
-                    "upsert": True
-                }
-            })
+            if fields is None:
+                bulk_operations.append(UpdateOne(
+                    {"_id": idea["_id"]},
+                    {"$set": idea},
+                    upsert=True
+                ))
+            else:
+                bulk_operations.append(UpdateOne(
+                    {"_id": idea["_id"]},
+                    {"$set": {key: idea[key] for key in fields if key in idea}}
+                ))
 
         # Execute bulk database operations
         if bulk_operations:
@@ -208,8 +298,10 @@ class IdeaProcessingService:
         self.parallel_embedder = ParallelEmbeddingProcessor()
         self.clustering_coordinator = ClusteringCoordinator()
         self.optimized_db = OptimizedDatabase()
-        self.websocket_clients = weakref.WeakSet()
-        self.active_discussions = set()
+        self.format_semaphore = asyncio.Semaphore(PARALLEL_AI_CALLS)
+        self.discussion_cache = TTLCache(maxsize=5000, ttl=DISCUSSION_LOCAL_CACHE_TTL_SECONDS)
+        # batch_processed payloads per discussion, coalesced until the throttle loop flushes them
+        self.pending_batch_events: Dict[str, Dict] = {}
 
     async def start(self):
         """Start the idea processing service"""
@@ -247,8 +339,7 @@ class IdeaProcessingService:
             }
 
             # Use Redis for persistent, scalable queuing
-            await self.redis.lpush(IDEA_BATCH_QUEUE, json.dumps(idea_data))
-            self.active_discussions.add(discussion_id)
+            await self.redis.lpush(IDEA_BATCH_QUEUE, orjson.dumps(idea_data))
 
             logger.info(f"✅ Successfully queued idea {idea_id} for batch processing")
 
@@ -259,42 +350,91 @@ class IdeaProcessingService:
     async def _process_idea_queue_loop(self):
         """Process idea queue for scalable processing"""
         logger.info("🚀 Idea queue processor started - ready to process ideas!")
-        while self.running:
-            try:
-                # Get pending ideas batch from Redis queue
-                batch_items = await self._get_pending_ideas_batch()
 
-                if batch_items:
-                    logger.info(f"📦 Found {len(batch_items)} items in batch, processing...")
-                    # Process idea batch with all optimizations
-                    asyncio.create_task(self._process_idea_batch(batch_items))
-                else:
-                    # No items, sleep briefly
-                    await asyncio.sleep(0.01)  # 10ms
+        # A batch is only popped from Redis once a slot is free, so ideas waiting for a worker
+        # stay in the durable Redis queue instead of process memory
+        batch_slots = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+        in_flight: Set[asyncio.Task] = set()
 
-            except Exception as e:
-                logger.error(f"Error in idea queue processor loop: {e}", exc_info=True)
-                await asyncio.sleep(1)  # Wait longer on error
+        try:
+            while self.running:
+                await batch_slots.acquire()
+                try:
+                    # Get pending ideas batch from Redis queue
+                    batch_items = await self._get_pending_ideas_batch()
+
+                    if batch_items:
+                        logger.info(f"📦 Found {len(batch_items)} items in batch, processing...")
+                        task = asyncio.create_task(self._run_batch(batch_items, batch_slots))
+                        in_flight.add(task)
+                        task.add_done_callback(in_flight.discard)
+                    else:
+                        # No items, sleep briefly
+                        batch_slots.release()
+                        await asyncio.sleep(0.01)  # 10ms
+
+                except Exception as e:
+                    batch_slots.release()
+                    logger.error(f"Error in idea queue processor loop: {e}", exc_info=True)
+                    await asyncio.sleep(1)  # Wait longer on error
+        finally:
+            # Give batches in progress a bounded window to finish, then cancel the rest
+            if in_flight:
+                _, unfinished = await asyncio.wait(in_flight, timeout=SHUTDOWN_DRAIN_TIMEOUT_SECONDS)
+                for task in unfinished:
+                    task.cancel()
+                if unfinished:
+                    logger.warning(f"Cancelled {len(unfinished)} idea batches still running at shutdown")
+
+    async def _run_batch(self, batch_items: List[Dict], batch_slots: asyncio.Semaphore):
+        """Process one idea batch and free its slot"""
+        try:
+            await self._process_idea_batch(batch_items)
+        except Exception as e:
+            logger.error(f"Unhandled error in idea batch: {e}", exc_info=True)
+        finally:
+            batch_slots.release()
 
     async def _get_pending_ideas_batch(self) -> List[Dict]:
         """Get a batch of pending ideas from Redis queue"""
+        raw_items = []
         try:
-            batch_items = []
+            # Block briefly for the first item so an idle queue doesn't spin
+            result = await self.redis.brpop(IDEA_BATCH_QUEUE, timeout=0.1)
+            if not result:
+                return []
 
-            # Get up to MEGA_BATCH_SIZE items efficiently
-            for _ in range(MEGA_BATCH_SIZE):
-                result = await self.redis.brpop(IDEA_BATCH_QUEUE, timeout=0.1)
-                if result:
-                    _, item_json = result
-                    item_data = json.loads(item_json)
-                    batch_items.append(item_data)
-                else:
-                    break  # No more items
+            _, item_json = result
+            raw_items.append(item_json)
+
+            # Drain the rest of the batch in one round-trip (RPOP with count, Redis >= 6.2)
+            try:
+                rest = await self.redis.rpop(IDEA_BATCH_QUEUE, MEGA_BATCH_SIZE - 1)
+            except Exception as e:
+                # Nothing was popped; carry on with what we have rather than lose it
+                logger.warning(f"Batch RPOP failed, processing a single idea: {e}")
+                rest = None
+            if rest:
+                raw_items.extend(rest)
+
+            # Decode one by one so a corrupt payload only costs itself
+            batch_items = []
+            for item in raw_items:
+                try:
+                    batch_items.append(orjson.loads(item))
+                except orjson.JSONDecodeError:
+                    logger.error(f"Dropping undecodable idea queue item: {item[:200]!r}")
 
             return batch_items
 
         except Exception as e:
             logger.error(f"Error getting ideas batch: {e}")
+            if raw_items:
+                # Put popped items back at the consuming end, in their original order
+                try:
+                    await self.redis.rpush(IDEA_BATCH_QUEUE, *reversed(raw_items))
+                except Exception as push_error:
+                    logger.error(f"Failed to requeue {len(raw_items)} popped ideas: {push_error}")
             return []
 
     async def _process_idea_batch(self, batch_items: List[Dict]):
@@ -311,15 +451,17 @@ class IdeaProcessingService:
             # Extract idea IDs
             idea_ids = [item['idea_id'] for item in batch_items]
 
-            # Update status to processing (bulk operation)
-            await self.db.ideas.update_many(
-                {"_id": {"$in": idea_ids}},
-                {"$set": {"status": IdeaStatus.PROCESSING}}
+            # Update status to processing (bulk operation) and fetch the ideas (single query) together;
+            # neither depends on the other, so the batch waits one round-trip instead of two
+            _, ideas = await asyncio.gather(
+                self.db.ideas.update_many(
+                    {"_id": {"$in": idea_ids}},
+                    {"$set": {"status": IdeaStatus.PROCESSING}}
+                ),
+                self.db.ideas.find({"_id": {"$in": idea_ids}}).to_list(length=None)
             )
-
-            # Fetch ideas from database (single query)
-            ideas_cursor = self.db.ideas.find({"_id": {"$in": idea_ids}})
-            ideas = await ideas_cursor.to_list(length=None)
+            for idea in ideas:
+                idea['status'] = IdeaStatus.PROCESSING
 
             if not ideas:
                 logger.warning(f"No ideas found for idea batch {batch_id}")
@@ -330,11 +472,12 @@ class IdeaProcessingService:
             for idea in ideas:
                 discussion_groups[idea['discussion_id']].append(idea)
 
-            # Process all discussion groups with mega optimizations
-            all_results = []
-            for discussion_id, discussion_ideas in discussion_groups.items():
-                results = await self._process_discussion_mega_optimized(discussion_ideas, discussion_id, batch_id)
-                all_results.extend(results)
+            # Process all discussion groups concurrently; they share the AI semaphores and rate limit
+            group_results = await asyncio.gather(*[
+                self._process_discussion_mega_optimized(discussion_ideas, discussion_id, batch_id)
+                for discussion_id, discussion_ideas in discussion_groups.items()
+            ])
+            all_results = [idea for results in group_results for idea in results]
 
             # Calculate performance metrics
             processing_time = time.time() - start_time
@@ -369,9 +512,11 @@ class IdeaProcessingService:
 
             discussion_context = f"Title:{discussion['title']} - Description: {discussion['prompt']}"
 
-            # 1. PARALLEL AI PROCESSING (format and embed ideas)
-            formatted_ideas = await self._batch_format_ideas(ideas, discussion_context)
-            embedded_ideas = await self.parallel_embedder.embed_ideas_parallel(formatted_ideas)
+            # 1. PARALLEL AI PROCESSING (format and embed each idea side by side)
+            embedded_ideas = await self.parallel_embedder.embed_ideas_parallel(
+                ideas,
+                format_fn=self._memoized_formatter(discussion_context)
+            )
 
             # 2. CENTROID CLUSTERING ENGINE (using clustering coordinator)
             clustering_result = await self.clustering_coordinator.process_centroid_clustering_batch(
@@ -382,11 +527,14 @@ class IdeaProcessingService:
             for idea in embedded_ideas:
                 idea['status'] = IdeaStatus.COMPLETED
 
+            # Counted once, after this batch's clustering writes, for both emits below
+            counts = await self._get_idea_counts(discussion_id)
+
             # 4. EFFICIENT WEBSOCKET UPDATES
-            await self._emit_batch_processed(embedded_ideas, discussion_id)
+            await self._emit_batch_processed(embedded_ideas, discussion_id, counts)
 
             # 5. EMIT UNPROCESSED COUNT UPDATE
-            await self._emit_unprocessed_count_update(discussion_id)
+            await self._emit_unprocessed_count_update(discussion_id, counts)
 
             logger.info(f"Real-Time Engine processed {clustering_result.get('count', 0)} ideas, "
                        f"created {clustering_result.get('new_topics', 0)} new topics")
@@ -400,20 +548,28 @@ class IdeaProcessingService:
             return []
 
     async def _get_discussion_cached(self, discussion_id: str) -> Optional[Dict]:
-        """Get discussion with Redis caching"""
+        """Get discussion with in-process and Redis caching"""
+        # Title and prompt never change mid-batch, so repeat batches skip Redis entirely
+        discussion = self.discussion_cache.get(discussion_id)
+        if discussion is not None:
+            return discussion
+
         cache_key = f"discussion:{discussion_id}"
 
         try:
-            # Try Redis cache first
+            # Try Redis cache next
             cached = await self.redis.get(cache_key)
             if cached:
-                return json.loads(cached)
+                discussion = orjson.loads(cached)
+                self.discussion_cache[discussion_id] = discussion
+                return discussion
 
             # Fallback to database
             discussion = await self.db.discussions.find_one({"_id": discussion_id})
             if discussion:
                 # Cache for 5 minutes
-                await self.redis.setex(cache_key, 300, json.dumps(discussion, default=str))
+                await self.redis.setex(cache_key, 300, orjson.dumps(discussion, default=str))
+                self.discussion_cache[discussion_id] = discussion
 
             return discussion
 
@@ -422,43 +578,60 @@ class IdeaProcessingService:
             # Direct database fallback
             return await self.db.discussions.find_one({"_id": discussion_id})
 
-    async def _batch_format_ideas(self, ideas: List[Dict], discussion_context: str) -> List[Dict]:
-        """Format multiple ideas efficiently"""
-        try:
-            formatted_results = []
-            for idea in ideas:
-                try:
-                    formatted_idea = await format_idea(idea['text'], discussion_context)
-                    idea_copy = idea.copy()
-
-                    # Handle both dict and object responses from AI
-                    if isinstance(formatted_idea, dict):
-                        # AI returned a dict
-                        idea_copy['intent'] = formatted_idea.get('intent')
-                        idea_copy['keywords'] = formatted_idea.get('keywords', [])
-                        idea_copy['sentiment'] = formatted_idea.get('sentiment')
-                        idea_copy['specificity'] = formatted_idea.get('specificity')
-                        idea_copy['related_topics'] = formatted_idea.get('related_topics', [])
-                        idea_copy['on_topic'] = formatted_idea.get('on_topic')
-                    else:
-                        # AI returned a FormattedIdea object
-                        idea_copy['intent'] = str(formatted_idea.intent.value) if formatted_idea.intent else None
-                        idea_copy['keywords'] = formatted_idea.keywords if formatted_idea.keywords else []
-                        idea_copy['sentiment'] = formatted_idea.sentiment if formatted_idea.sentiment else None
-                        idea_copy['specificity'] = formatted_idea.specificity if formatted_idea.specificity else None
-                        idea_copy['related_topics'] = formatted_idea.related_topics if formatted_idea.related_topics else []
-                        idea_copy['on_topic'] = formatted_idea.on_topic if formatted_idea.on_topic is not None else None
-
-                    formatted_results.append(idea_copy)
-                except Exception as e:
-                    logger.error(f"Error formatting idea {idea['_id']}: {e}")
-                    formatted_results.append(idea)  # Keep original
-
-            return formatted_results
-
-        except Exception as e:
-            logger.error(f"Batch formatting failed: {e}")
-            return ideas  # Return original ideas if formatting fails
+    def _memoized_formatter(self, discussion_context: str):
+        """Per-discussion format function that calls the AI once per distinct idea text.
+
+        Duplicates (resubmissions, templated answers) wait on the first call and copy its AI fields.
+        """
+        pending: Dict[object, tuple] = {}
+
+        async def format_once(idea: Dict) -> Dict:
+            key = _text_key(idea.get('text'), id(idea))
+            if key not in pending:
+                pending[key] = (idea, asyncio.ensure_future(self._format_single_idea(idea, discussion_context)))
+            source, task = pending[key]
+            formatted = await task
+            if source is idea:
+                return formatted
+            if formatted is source:
+                return idea  # Formatting failed for this text; keep original
+            idea_copy = idea.copy()
+            for field in AI_IDEA_FIELDS:
+                if field in formatted:
+                    idea_copy[field] = formatted[field]
+            return idea_copy
+
+        return format_once
+
+    async def _format_single_idea(self, idea: Dict, discussion_context: str) -> Dict:
+        """Format one idea under the format semaphore; falls back to the original on error"""
+        async with self.format_semaphore:
+            try:
+                formatted_idea = await format_idea(idea['text'], discussion_context)
+                idea_copy = idea.copy()
+
+                # Handle both dict and object responses from AI
+                if isinstance(formatted_idea, dict):
+                    # AI returned a dict
+                    idea_copy['intent'] = formatted_idea.get('intent')
+                    idea_copy['keywords'] = formatted_idea.get('keywords', [])
+                    idea_copy['sentiment'] = formatted_idea.get('sentiment')
+                    idea_copy['specificity'] = formatted_idea.get('specificity')
+                    idea_copy['related_topics'] = formatted_idea.get('related_topics', [])
+                    idea_copy['on_topic'] = formatted_idea.get('on_topic')
+                else:
+                    # AI returned a FormattedIdea object
+                    idea_copy['intent'] = str(formatted_idea.intent.value) if formatted_idea.intent else None
+                    idea_copy['keywords'] = formatted_idea.keywords if formatted_idea.keywords else []
+                    idea_copy['sentiment'] = formatted_idea.sentiment if formatted_idea.sentiment else None
+                    idea_copy['specificity'] = formatted_idea.specificity if formatted_idea.specificity else None
+                    idea_copy['related_topics'] = formatted_idea.related_topics if formatted_idea.related_topics else []
+                    idea_copy['on_topic'] = formatted_idea.on_topic if formatted_idea.on_topic is not None else None
+
+                return idea_copy
+            except Exception as e:
+                logger.error(f"Error formatting idea {idea['_id']}: {e}")
+                return idea  # Keep original
 
     async def _bulk_save_clustered_ideas(self, clustered_ideas: List[Dict], discussion_id: str):
         """Bulk save ideas that are already clustered"""
@@ -467,8 +640,8 @@ class IdeaProcessingService:
             for idea in clustered_ideas:
                 idea['status'] = IdeaStatus.COMPLETED
 
-            # Use optimized database save
-            await self.optimized_db.bulk_save_optimized(clustered_ideas)
+            # Use optimized database save; the rest of each idea (embedding included) is already stored
+            await self.optimized_db.bulk_save_optimized(clustered_ideas, fields=CLUSTERED_IDEA_FIELDS)
 
             logger.info(f"Bulk saved {len(clustered_ideas)} clustered ideas for discussion {discussion_id}")
 
@@ -477,46 +650,90 @@ class IdeaProcessingService:
             # Fallback to individual saves
             await self._fallback_individual_saves(clustered_ideas, discussion_id)
 
-    async def _emit_batch_processed(self, clustered_ideas: List[Dict], discussion_id: str):
-        """Emit efficient batch processed event with unclustered count"""
+    async def _get_idea_counts(self, discussion_id: str) -> Optional[Dict[str, int]]:
+        """Unclustered / needs-embedding / needs-clustering counts for a discussion in one pass (None on error)"""
+        try:
+            # $ifNull folds missing fields into null, matching count_documents' {"field": None}
+            no_embedding = {"$eq": [{"$ifNull": ["$embedding", None]}, None]}
+            has_embedding = {"$ne": [{"$ifNull": ["$embedding", None]}, None]}
+            no_topic = {"$eq": [{"$ifNull": ["$topic_id", None]}, None]}
+            cursor = await self.db.ideas.aggregate([
+                {"$match": {"discussion_id": discussion_id}},
+                {"$group": {
+                    "_id": None,
+                    "unclustered": {"$sum": {"$cond": [no_topic, 1, 0]}},
+                    "needs_embedding": {"$sum": {"$cond": [no_embedding, 1, 0]}},
+                    "needs_clustering": {"$sum": {"$cond": [{"$and": [has_embedding, no_topic]}, 1, 0]}}
+                }}
+            ])
+            results = await cursor.to_list(1)
+
+            counts = {"unclustered": 0, "needs_embedding": 0, "needs_clustering": 0}
+            if results:
+                counts.update({key: results[0][key] for key in counts})
+            return counts
+
+        except Exception as e:
+            logger.error(f"Error counting ideas for discussion {discussion_id}: {e}")
+            return None
+
+    async def _emit_batch_processed(self, clustered_ideas: List[Dict], discussion_id: str, counts: Optional[Dict[str, int]]):
+        """Queue a batch processed event with unclustered count; the throttle loop emits it"""
+        if counts is None:
+            return
+
         try:
             # Prepare ideas for client
             client_ideas = [self._prepare_idea_for_client(idea) for idea in clustered_ideas]
 
-            # Calculate updated unclustered count
-            unclustered_count = await self.db.ideas.count_documents({
-                "discussion_id": discussion_id,
-                "topic_id": None
-            })
+            # Updated unclustered count
+            unclustered_count = counts["unclustered"]
 
+            # Coalesce with anything already waiting for this discussion; latest count wins
+            event = self.pending_batch_events.setdefault(discussion_id, {'ideas': [], 'unclustered_count': 0})
+            event['ideas'].extend(client_ideas)
+            event['unclustered_count'] = unclustered_count
+
+            # Don't let a busy discussion hold an unbounded payload until the next tick
+            if len(event['ideas']) >= MAX_WEBSOCKET_QUEUE_SIZE:
+                await self._send_batch_event(discussion_id, self.pending_batch_events.pop(discussion_id))
+
+        except Exception as e:
+            logger.error(f"Error emitting batch processed event: {e}")
+
+    async def _flush_batch_events(self):
+        """Emit one batch_processed event per discussion for everything coalesced since the last flush"""
+        if not self.pending_batch_events:
+            return
+        pending, self.pending_batch_events = self.pending_batch_events, {}
+        for discussion_id, event in pending.items():
+            await self._send_batch_event(discussion_id, event)
+
+    async def _send_batch_event(self, discussion_id: str, event: Dict):
+        """Send a coalesced batch_processed event to a discussion room"""
+        try:
             # Send single batch event with unclustered count
             await sio.emit('batch_processed', {
                 'discussion_id': discussion_id,
-                'ideas': client_ideas,
-                'count': len(client_ideas),
-                'unclustered_count': unclustered_count,  # Add real-time count update
+                'ideas': event['ideas'],
+                'count': len(event['ideas']),
+                'unclustered_count': event['unclustered_count'],  # Add real-time count update
                 'incremental_update': True
             }, room=discussion_id)
 
-            logger.debug(f"Emitted batch_processed event for {len(clustered_ideas)} ideas in discussion {discussion_id}, unclustered: {unclustered_count}")
+            logger.debug(f"Emitted batch_processed event for {len(event['ideas'])} ideas in discussion {discussion_id}, unclustered: {event['unclustered_count']}")
 
         except Exception as e:
             logger.error(f"Error emitting batch processed event: {e}")
 
-    async def _emit_unprocessed_count_update(self, discussion_id: str):
+    async def _emit_unprocessed_count_update(self, discussion_id: str, counts: Optional[Dict[str, int]]):
         """Emit WebSocket event with updated unprocessed counts"""
+        if counts is None:
+            return
+
         try:
-            # Get current counts
-            total_embedding = await self.db.ideas.count_documents({
-                "discussion_id": discussion_id,
-                "embedding": None
-            })
-
-            total_clustering = await self.db.ideas.count_documents({
-                "discussion_id": discussion_id,
-                "embedding": {"$ne": None},
-                "topic_id": None
-            })
+            total_embedding = counts["needs_embedding"]
+            total_clustering = counts["needs_clustering"]
 
             total_unprocessed = total_embedding + total_clustering
 
@@ -537,25 +754,40 @@ class IdeaProcessingService:
         """Efficient WebSocket throttling loop"""
         while self.running:
             try:
-                # Simple throttling - batch processor handles events efficiently
-                await asyncio.sleep(0.1)  # 100ms check interval
+                # Emit coalesced batch_processed events at most once per window per discussion
+                await asyncio.sleep(WEBSOCKET_THROTTLE_MS / 1000)
+                await self._flush_batch_events()
 
             except Exception as e:
                 logger.error(f"Error in WebSocket throttle loop: {e}", exc_info=True)
                 await asyncio.sleep(1)
 
+        # Don't drop events buffered when the service stops
+        await self._flush_batch_events()
+
     async def _cleanup_loop(self):
         """Cleanup old data and manage memory"""
         while self.running:
             try:
-                # Clean up old WebSocket queues
+                # Clean up old WebSocket queues (SCAN doesn't block Redis the way KEYS does)
                 pattern = f"{WEBSOCKET_QUEUE_PREFIX}*"
-                keys = await self.redis.keys(pattern)
+                keys = [key async for key in self.redis.scan_iter(match=pattern, count=CLEANUP_SCAN_COUNT)]
+
+                for start in range(0, len(keys), CLEANUP_SCAN_COUNT):
+                    chunk = keys[start:start + CLEANUP_SCAN_COUNT]
 
-                for key in keys:
-                    ttl = await self.redis.ttl(key)
-                    if ttl == -1:  # No expiry set
-                        await self.redis.expire(key, 300)  # Set 5 minute expiry
+                    # One round-trip for all TTLs in the chunk, one for the EXPIREs
+                    pipe = self.redis.pipeline(transaction=False)
+                    for key in chunk:
+                        pipe.ttl(key)
+                    ttls = await pipe.execute()
+
+                    no_expiry = [key for key, ttl in zip(chunk, ttls) if ttl == -1]  # No expiry set
+                    if no_expiry:
+                        pipe = self.redis.pipeline(transaction=False)
+                        for key in no_expiry:
+                            pipe.expire(key, 300)  # Set 5 minute expiry
+                        await pipe.execute()
 
                 # Clear any cached data periodically
                 # Note: Clustering coordinator manages its own cache cleanup
@@ -568,17 +800,15 @@ class IdeaProcessingService:
 
     def _prepare_idea_for_client(self, idea: Dict) -> Dict:
         """Prepare idea data for client consumption"""
-        from datetime import datetime
-
-        idea_for_client = idea.copy()
-        idea_for_client["id"] = idea_for_client["_id"]
-
-        # Remove internal fields that shouldn't be sent to client
-        idea_for_client.pop("_id", None)
-        idea_for_client.pop("embedding", None)  # Don't send large embedding arrays
+        # Build from the known client fields, so internal ones (embedding, last_attempt) never go out
+        idea_for_client = {"id": idea["_id"]}
+        for key in CLIENT_IDEA_FIELDS:
+            if key in idea:
+                idea_for_client[key] = idea[key]
 
         # Convert datetime objects to ISO strings for JSON serialization
-        for key, value in idea_for_client.items():
+        for key in CLIENT_IDEA_DATETIME_FIELDS:
+            value = idea_for_client.get(key)
             if isinstance(value, datetime):
                 idea_for_client[key] = value.isoformat()
 
@@ -591,8 +821,7 @@ class IdeaProcessingService:
                 idea['status'] = IdeaStatus.COMPLETED
                 await self.db.ideas.update_one(
                     {"_id": idea["_id"]},
-                    {"$set": idea},
-                    upsert=True
+                    {"$set": {key: idea[key] for key in CLUSTERED_IDEA_FIELDS if key in idea}}
                 )
             except Exception as e:
                 logger.error(f"Individual save failed for idea {idea['_id']}: {e}")
@@ -622,7 +851,7 @@ class IdeaProcessingService:
                     'queued_at': time.time(),
                     'data': idea
                 }
-                await self.redis.lpush(queue_key, json.dumps(idea_data, default=str))
+                await self.redis.lpush(queue_key, orjson.dumps(idea_data, default=str))
 
             logger.info(f"Queued {len(ideas)} ideas for discussion {discussion_id} during Big Bang clustering")
 
@@ -87,21 +87,27 @@ class ClusteringCoordinator:
             ideas_to_update = {}
             outliers = []
 
-            for idea in valid_ideas:
-                # Update last_attempt timestamp when starting processing
-                await self.db.ideas.update_one(
-                    {"_id": idea["_id"]},
-                    {"$currentDate": {"last_attempt": True}}
-                )
-
-                result = await self._process_single_idea(idea, existing_topics)
+            # Update last_attempt timestamp for the whole batch when starting processing
+            await self.db.ideas.update_many(
+                {"_id": {"$in": [idea["_id"] for idea in valid_ideas]}},
+                {"$currentDate": {"last_attempt": True}}
+            )
 
-                if result['action'] == 'assign':
-                    ideas_to_update[str(idea['_id'])] = result['topic_id']
-                    # Update topic centroid cache
-                    await self._update_topic_centroid_cache(result['topic_id'], idea['embedding'], existing_topics)
-                elif result['action'] == 'create':
-                    outliers.append(idea)
+            try:
+                assignments, outliers = self._assign_ideas_to_topics(valid_ideas, existing_topics)
+                ideas_to_update.update(assignments)
+            except ValueError as e:
+                # Ragged or mismatched embeddings can't be stacked; compare them pair by pair instead
+                logger.warning(f"Falling back to per-idea centroid matching: {e}")
+                for idea in valid_ideas:
+                    result = await self._process_single_idea(idea, existing_topics)
+
+                    if result['action'] == 'assign':
+                        ideas_to_update[str(idea['_id'])] = result['topic_id']
+                        # Update topic centroid cache
+                        await self._update_topic_centroid_cache(result['topic_id'], idea['embedding'], existing_topics)
+                    elif result['action'] == 'create':
+                        outliers.append(idea)
             
             # Handle outliers with mini-clustering
             if outliers:
@@ -115,8 +121,10 @@ class ClusteringCoordinator:
 
             # Emit WebSocket updates for real-time UI updates
             if ideas_to_update:
-                await self._emit_unprocessed_count_update(discussion_id)
-                await self._emit_batch_processed(valid_ideas, discussion_id)
+                await asyncio.gather(
+                    self._emit_unprocessed_count_update(discussion_id),
+                    self._emit_batch_processed(valid_ideas, discussion_id)
+                )
 
             logger.info(f"Centroid Clustering batch complete: {len(ideas_to_update)} ideas processed")
             return {
@@ -280,6 +288,78 @@ class ClusteringCoordinator:
             logger.error(f"Failed to fetch topic centroids: {e}")
             return []
 
+    def _assign_ideas_to_topics(self, ideas: List[dict], existing_topics: List[dict]) -> tuple[Dict[str, str], List[dict]]:
+        """
+        Match ideas against existing topic centroids, scoring the whole batch with one matrix product.
+
+        Embeddings and centroids are stacked into arrays once. After each assignment the matched
+        centroid row, its count and its adaptive threshold are updated in place, and moved topics
+        are re-scored for later ideas, so they see the same running centroids as the per-idea path.
+
+        Returns:
+            (idea_id -> topic_id assignments, ideas that need a new topic)
+
+        Raises:
+            ValueError: if the embeddings can't be stacked into matching 2-D arrays
+        """
+        if not existing_topics:
+            return {}, list(ideas)
+
+        idea_matrix = np.asarray([idea['embedding'] for idea in ideas], dtype=float)
+        centroids = np.asarray([topic['centroid'] for topic in existing_topics], dtype=float)
+        if idea_matrix.ndim != 2 or centroids.ndim != 2 or idea_matrix.shape[1] != centroids.shape[1]:
+            raise ValueError(f"embedding shapes {idea_matrix.shape} and {centroids.shape} don't match")
+
+        topic_ids = [topic['_id'] for topic in existing_topics]
+        counts = [topic.get('count', 1) for topic in existing_topics]
+        thresholds = np.asarray([self._get_adaptive_threshold(count) for count in counts], dtype=float)
+        centroid_norms = np.linalg.norm(centroids, axis=1)
+        idea_norms = np.linalg.norm(idea_matrix, axis=1)
+
+        # Dot products of the whole batch against the loaded centroids in one GEMM; only
+        # topics whose centroid has moved since need re-scoring per idea
+        dots = idea_matrix @ centroids.T
+        moved = np.zeros(len(topic_ids), dtype=bool)
+        moved_topics = []
+
+        assignments = {}
+        outliers = []
+        for i, idea in enumerate(ideas):
+            scores = dots[i]
+            if moved_topics:
+                scores[moved_topics] = centroids[moved_topics] @ idea_matrix[i]
+
+            # Cosine similarity against every topic; zero-norm vectors score 0.0
+            denominators = centroid_norms * idea_norms[i]
+            similarities = np.divide(
+                scores, denominators,
+                out=np.zeros(len(topic_ids)), where=denominators != 0
+            )
+
+            # Best topic that clears its own adaptive threshold (first one wins ties)
+            candidates = np.where((similarities > thresholds) & (similarities > 0.0), similarities, -np.inf)
+            best = int(np.argmax(candidates))
+
+            if np.isfinite(candidates[best]):
+                topic_id = topic_ids[best]
+                logger.info(f"Centroid Clustering Engine: ASSIGNED idea to existing topic {topic_id[:8]}... with similarity {candidates[best]:.3f}")
+                assignments[str(idea['_id'])] = topic_id
+
+                # Weighted average: (old_centroid * count + new_embedding) / (count + 1)
+                count = counts[best]
+                centroids[best] = (centroids[best] * count + idea_matrix[i]) / (count + 1)
+                centroid_norms[best] = np.linalg.norm(centroids[best])
+                counts[best] = count + 1
+                thresholds[best] = self._get_adaptive_threshold(counts[best])
+                if not moved[best]:
+                    moved[best] = True
+                    moved_topics.append(best)
+            else:
+                logger.info(f"Centroid Clustering Engine: CREATING new topic (best similarity was {similarities.max():.3f})")
+                outliers.append(idea)
+
+        return assignments, outliers
+
     async def _process_single_idea(self, idea: dict, existing_topics: List[dict]) -> Dict[str, Any]:
         """Process a single idea against existing topics using adaptive thresholds."""
         if not existing_topics:
@@ -369,8 +449,8 @@ class ClusteringCoordinator:
             logger.info("Only one idea, creating single topic")
             return await self._create_single_topic(ideas[0], discussion_id)
 
-        # Extract embeddings
-        embeddings = np.array([idea['embedding'] for idea in ideas])
+        # Extract embeddings as one contiguous float32 matrix (half the memory of float64)
+        embeddings = np.array([idea['embedding'] for idea in ideas], dtype=np.float32)
 
         # Validate embeddings
         if embeddings.size == 0 or len(embeddings.shape) != 2:
@@ -566,7 +646,7 @@ class ClusteringCoordinator:
             } for idea in ideas]
 
         # Apply more aggressive clustering
-        embeddings = np.array([idea['embedding'] for idea in ideas])
+        embeddings = np.array([idea['embedding'] for idea in ideas], dtype=np.float32)
         # Ensure max_topics doesn't exceed number of ideas
         actual_clusters = min(max_topics, len(ideas))
 
@@ -603,8 +683,9 @@ class ClusteringCoordinator:
     async def _create_final_topics(self, all_topics: List[dict], discussion_id: str) -> List[Dict[str, Any]]:
         """Create final topic objects with appropriate naming."""
         final_topics = []
+        centroids = self._topic_centroids(all_topics)
 
-        for topic in all_topics:
+        for topic, centroid in zip(all_topics, centroids):
             # Generate topic name based on stage
             if topic['stage'] == 'group':
                 # AI naming for groups
@@ -621,16 +702,12 @@ class ClusteringCoordinator:
                 topic_name = idea_text[:50] + "..." if len(idea_text) > 50 else idea_text
                 topic_description = idea_text
 
-            # Calculate centroid
-            embeddings = [idea['embedding'] for idea in topic['ideas']]
-            centroid = np.mean(embeddings, axis=0).tolist()
-
             final_topic = {
                 "_id": str(uuid.uuid4()),
                 "discussion_id": discussion_id,
                 "name": topic_name,
                 "description": topic_description,
-                "centroid": centroid,
+                "centroid": centroid.tolist(),
                 "idea_count": topic['size'],
                 "ideas": topic['ideas'],
                 "clustering_stage": topic['stage'],
@@ -641,6 +718,20 @@ class ClusteringCoordinator:
 
         return final_topics
 
+    def _topic_centroids(self, topics: List[dict]) -> np.ndarray:
+        """Mean embedding of every topic, computed in one pass over all ideas.
+
+        Ideas are stacked topic by topic, so each topic is a contiguous run of rows
+        and a single reduceat sums them all.
+        """
+        if not topics:
+            return np.empty((0, 0))
+
+        sizes = np.array([len(topic['ideas']) for topic in topics])
+        embeddings = np.array([idea['embedding'] for topic in topics for idea in topic['ideas']], dtype=np.float32)
+        offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        return np.add.reduceat(embeddings, offsets, axis=0) / sizes[:, None]
+
     async def _cluster_outliers(self, outliers: List[dict], discussion_id: str) -> Dict[str, Any]:
         """Apply mini-DBSCAN clustering to outlier ideas."""
         if len(outliers) < 3:
@@ -700,7 +791,7 @@ class ClusteringCoordinator:
             return {"topic_ops": topic_ops, "idea_assignments": idea_assignments}
 
         # Use only valid outliers for clustering
-        embeddings = np.array([idea['embedding'] for idea in valid_outliers])
+        embeddings = np.array([idea['embedding'] for idea in valid_outliers], dtype=np.float32)
 
         clustering = DBSCAN(eps=0.25, min_samples=2, metric='cosine')
         labels = clustering.fit_predict(embeddings)
@@ -871,14 +962,13 @@ class ClusteringCoordinator:
                     }
                     topics_for_db.append(topic_for_db)
 
-                await db.topics.insert_many(topics_for_db)
-                logger.info(f"Inserted {len(topics_for_db)} new topics")
-
-                # Update idea assignments
+                # Idea assignments: one UpdateMany per topic, sent in a single bulk_write
+                from pymongo import UpdateMany
+                idea_bulk_ops = []
                 for topic in final_topics:
                     idea_ids = [idea['_id'] for idea in topic['ideas']]
                     if idea_ids:
-                        await db.ideas.update_many(
+                        idea_bulk_ops.append(UpdateMany(
                             {"_id": {"$in": idea_ids}},
                             {
                                 "$set": {
@@ -886,9 +976,16 @@ class ClusteringCoordinator:
                                     "status": "completed"
                                 }
                             }
-                        )
+                        ))
 
-                logger.info("Updated idea assignments")
+                # The topic insert and the idea assignments touch different collections,
+                # so they go out together (the delete above must still land first)
+                writes = [db.topics.insert_many(topics_for_db)]
+                if idea_bulk_ops:
+                    writes.append(db.ideas.bulk_write(idea_bulk_ops, ordered=False))
+                await asyncio.gather(*writes)
+
+                logger.info(f"Inserted {len(topics_for_db)} new topics and updated idea assignments")
 
             # Prepare results for client
             topic_results = []
@@ -915,16 +1012,17 @@ class ClusteringCoordinator:
         """Emit WebSocket event with updated unprocessed counts"""
         try:
             # Get current counts
-            total_embedding = await self.db.ideas.count_documents({
-                "discussion_id": discussion_id,
-                "embedding": None
-            })
-
-            total_clustering = await self.db.ideas.count_documents({
-                "discussion_id": discussion_id,
-                "embedding": {"$ne": None},
-                "topic_id": None
-            })
+            total_embedding, total_clustering = await asyncio.gather(
+                self.db.ideas.count_documents({
+                    "discussion_id": discussion_id,
+                    "embedding": None
+                }),
+                self.db.ideas.count_documents({
+                    "discussion_id": discussion_id,
+                    "embedding": {"$ne": None},
+                    "topic_id": None
+                })
+            )
 
             total_unprocessed = total_embedding + total_clustering
 
@@ -35,7 +35,8 @@ def cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
 
 
 async def generate_topic_title(topic_id: str):
-    topic_ideas = await get_ideas_by_topic_id(topic_id)
+    # Only the text feeds the prompt; skip embeddings and the rest of each document
+    topic_ideas = await get_ideas_by_topic_id(topic_id, {"_id": 0, "text": 1})
     # Generate topic name using AI
     simplified_ideas = [{"text": idea["text"]} for idea in topic_ideas]
 
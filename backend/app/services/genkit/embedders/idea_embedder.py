@@ -14,22 +14,17 @@ ai = Genkit(
     model=EMBEDDING_MODEL,
 )
 
-async def embed_ideas(ideas: list) -> list:
-    """Create embeddings for the given texts"""
-    embedded_ideas = []
-    
-    for idea in ideas:
-        options = {'task_type': EmbeddingTaskType.CLUSTERING}
-        embedding_response = await ai.embed(
-            embedder=EMBEDDING_MODEL,
-            documents=[Document.from_text(idea['text'])],
-            options=options,
-        )
-        if embedding_response.embeddings:
-            idea_copy = dict(idea)
-            idea_copy["embedding"] = embedding_response.embeddings[0].embedding
-            embedded_ideas.append(idea_copy)
-    return embedded_ideas
+async def embed_texts(texts: list) -> list:
+    """Create embeddings for many texts in one request, in input order"""
+    options = {'task_type': EmbeddingTaskType.CLUSTERING}
+    embedding_response = await ai.embed(
+        embedder=EMBEDDING_MODEL,
+        documents=[Document.from_text(text) for text in texts],
+        options=options,
+    )
+    if len(embedding_response.embeddings) != len(texts):
+        raise ValueError(f"Expected {len(texts)} embeddings, got {len(embedding_response.embeddings)}")
+    return [embedding.embedding for embedding in embedding_response.embeddings]
 
 async def embed_idea(text: str):
     """Create embeddings for the given texts"""
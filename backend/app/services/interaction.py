@@ -597,7 +597,7 @@ class InteractionService:
             }}
         ]
         
-        results = await db.entity_metrics.aggregate(pipeline).to_list(length=limit)
+        results = await (await db.entity_metrics.aggregate(pipeline)).to_list(length=limit)
         return results
 
 
@@ -641,7 +641,7 @@ class InteractionService:
                 }}
             ]
 
-            result = await db.interaction_events.aggregate(pipeline).to_list(length=1)
+            result = await (await db.interaction_events.aggregate(pipeline)).to_list(length=1)
 
             if result:
                 data = result[0]
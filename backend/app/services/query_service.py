@@ -12,7 +12,8 @@ import time
 from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional, Tuple, TypeVar, Generic, Type, Callable, cast
 
-from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo import ASCENDING, DESCENDING
 from fastapi import Request, HTTPException, status
 from pydantic import BaseModel
@@ -130,9 +131,9 @@ class MongoDBQueryService(Generic[T_ResponseModel, T_Query_Params]):
         
         logger.debug(f"Initialized MongoDBQueryService for '{collection_name}' with param model {self._param_model_cls.__name__}")
 
-    async def get_collection(self) -> AsyncIOMotorCollection:
+    async def get_collection(self) -> AsyncCollection:
         """Returns the MongoDB collection instance."""
-        db: AsyncIOMotorDatabase = await get_db()
+        db: AsyncDatabase = await get_db()
         return db[self.collection_name]
         
     async def _has_text_index(self) -> bool:
@@ -399,7 +400,7 @@ class MongoDBQueryService(Generic[T_ResponseModel, T_Query_Params]):
                 pipeline = self._build_aggregation_pipeline(final_query, sort_spec, skip, limit, projection)
                 logger.debug(f"Executing Aggregation Pipeline ({self.collection_name}): {pipeline}")
                 
-                agg_cursor = collection.aggregate(pipeline)
+                agg_cursor = await collection.aggregate(pipeline)
                 # The pipeline is designed to return a single document with 'items' and 'total_items'
                 agg_result_list = await agg_cursor.to_list(length=1) 
                 
@@ -85,7 +85,7 @@ class UnprocessedIdeasService:
 
         # Get total count for pagination
         count_pipeline = pipeline + [{"$count": "total"}]
-        count_result = await db.ideas.aggregate(count_pipeline).to_list(None)
+        count_result = await (await db.ideas.aggregate(count_pipeline)).to_list(None)
         total_items = count_result[0]["total"] if count_result else 0
 
         # Get paginated results
@@ -94,7 +94,7 @@ class UnprocessedIdeasService:
             {"$limit": params.page_size}
         ]
 
-        drifting_ideas = await db.ideas.aggregate(paginated_pipeline).to_list(None)
+        drifting_ideas = await (await db.ideas.aggregate(paginated_pipeline)).to_list(None)
 
         # Format ideas for response
         formatted_ideas = [self._format_idea(idea) for idea in drifting_ideas]
@@ -242,7 +242,7 @@ class UnprocessedIdeasService:
 
         # Get total count for pagination
         count_pipeline = pipeline + [{"$count": "total"}]
-        count_result = await db.ideas.aggregate(count_pipeline).to_list(None)
+        count_result = await (await db.ideas.aggregate(count_pipeline)).to_list(None)
         total_items = count_result[0]["total"] if count_result else 0
 
         # Get paginated results
@@ -251,7 +251,7 @@ class UnprocessedIdeasService:
             {"$limit": page_size}
         ]
 
-        unprocessed_ideas = await db.ideas.aggregate(paginated_pipeline).to_list(None)
+        unprocessed_ideas = await (await db.ideas.aggregate(paginated_pipeline)).to_list(None)
 
         # Format ideas for response
         formatted_ideas = [self._format_idea(idea) for idea in unprocessed_ideas]
@@ -19,6 +19,6 @@ async def get_ideas_by_discussion_id(discussion_id: str) -> list:
     db = await get_db()
     return await db.ideas.find({"discussion_id": discussion_id}).to_list(length=None)
 
-async def get_ideas_by_topic_id(topic_id: str) -> list:
+async def get_ideas_by_topic_id(topic_id: str, projection: Dict[str, Any] = None) -> list:
     db = await get_db()
-    return await db.ideas.find({"topic_id": topic_id}).to_list(length=None)
\ No newline at end of file
+    return await db.ideas.find({"topic_id": topic_id}, projection).to_list(length=None)
\ No newline at end of file
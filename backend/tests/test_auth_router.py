@@ -0,0 +1,82 @@
+"""Router tests for the password reset request flow."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.limiter import limiter
+from app.routers import auth as auth_router
+
+VERIFIED_USER = {
+    "_id": "user-1",
+    "email": "user@example.com",
+    "username": "someone",
+    "password": "hash",
+    "is_verified": True,
+    "verification_code": "123456",
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    users = {VERIFIED_USER["email"]: dict(VERIFIED_USER)}
+    sent_emails = []
+
+    async def get_user_by_email(email, projection=None):
+        # Apply the projection like MongoDB would, so missing fields surface as in production
+        user = users.get(email)
+        if user is None or projection is None:
+            return user
+        return {key: value for key, value in user.items() if projection.get(key)}
+
+    async def create_password_reset_token(user_id):
+        return f"token-for-{user_id}"
+
+    async def send_password_reset_email(email, username, token):
+        sent_emails.append((email, username, token))
+
+    monkeypatch.setattr(auth_router, "get_user_by_email", get_user_by_email)
+    monkeypatch.setattr(auth_router, "create_password_reset_token", create_password_reset_token)
+    monkeypatch.setattr(auth_router, "send_password_reset_email", send_password_reset_email)
+
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.include_router(auth_router.router)
+    limiter.reset()
+
+    with TestClient(app) as test_client:
+        test_client.sent_emails = sent_emails
+        test_client.users = users
+        yield test_client
+
+
+def test_forgot_password_sends_reset_email_to_verified_user(client):
+    response = client.post("/auth/forgot-password", json={"email": "user@example.com"})
+
+    assert response.status_code == 200
+    assert client.sent_emails == [("user@example.com", "someone", "token-for-user-1")]
+
+
+def test_forgot_password_skips_unverified_user(client):
+    client.users["user@example.com"]["is_verified"] = False
+
+    response = client.post("/auth/forgot-password", json={"email": "user@example.com"})
+
+    assert response.status_code == 200
+    assert client.sent_emails == []
+
+
+def test_forgot_password_does_not_reveal_unknown_email(client):
+    response = client.post("/auth/forgot-password", json={"email": "nobody@example.com"})
+
+    assert response.status_code == 200
+    assert response.json() == client.post(
+        "/auth/forgot-password", json={"email": "user@example.com"}
+    ).json()
+    assert client.sent_emails == [("user@example.com", "someone", "token-for-user-1")]
+
+
+def test_forgot_password_requires_email(client):
+    response = client.post("/auth/forgot-password", json={})
+
+    assert response.status_code == 400